@@ -0,0 +1,52 @@
+"""Rendimiento del motor de simulaciones vectorizado (NumPy) para lotes de 1 a 4096.
+
+Uso: python benchmarks/bench_batch_playouts.py [--size 11] [--seconds 1]
+
+Compara las simulaciones por segundo de BatchPlayoutEngine con las de la simulación
+en Python puro de MCTSPlayer sobre la misma posición.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from batch_playouts import BatchPlayoutEngine
+from mcts_player import MCTSPlayer
+from common import random_board
+
+BATCHES = [1, 4, 16, 64, 256, 1024, 4096]
+
+
+def rate(function, playouts_per_call: int, seconds: float) -> float:
+    """Simulaciones por segundo llamando a `function` durante `seconds`"""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        function()
+        calls += 1
+    return calls * playouts_per_call / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    board = random_board(args.size, args.size, args.size)
+    engine = BatchPlayoutEngine(seed=0)
+    mcts = MCTSPlayer(1, 1, seed=0)
+    bits1, bits2 = mcts.board_bits(board)
+
+    python_rate = rate(lambda: mcts.playout(args.size, bits1, bits2, 1), 1, args.seconds)
+    print(f"Python puro (MCTSPlayer.playout): {python_rate:.0f} sim/s")
+    print(f"{'lote':>6} {'sim/s':>10} {'vs Python':>10}")
+    for batch in BATCHES:
+        batch_rate = rate(lambda: engine.winners(engine.simulate(board, 1, batch)), batch, args.seconds)
+        print(f"{batch:>6} {batch_rate:>10.0f} {batch_rate / python_rate:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compara nodos por segundo de HexBoard (listas) contra BitHexBoard (máscaras de bits).
+
+Uso: python benchmarks/bench_board.py [--sizes 7 11 13] [--depth 3] [--branch 8]
+
+Cada nodo hace lo mismo que un nodo de HexAIPlayer.minimax: dos check_connection,
+get_possible_moves y, por cada hijo, clone + place_piece. Los dos tableros deben recorrer
+exactamente los mismos nodos (mismas jugadas en el mismo orden y mismas conexiones).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from bitboard_hexboard import BitHexBoard
+from common import random_board
+
+
+def search(board, depth: int, branch: int, player: int) -> int:
+    """Recorrido de profundidad fija; devuelve el número de nodos visitados"""
+    nodes = 1
+    if board.check_connection(1) or board.check_connection(2) or depth == 0:
+        return nodes
+    moves = board.get_possible_moves()
+    for move in moves[:branch]:
+        child = board.clone()
+        child.place_piece(*move, player)
+        nodes += search(child, depth - 1, branch, 3 - player)
+    return nodes
+
+
+def measure(board_class, matrix: list, depth: int, branch: int, repeat: int) -> tuple:
+    """Devuelve (nodos por segundo, mejor de `repeat` ejecuciones; nodos del recorrido)"""
+    best = 0.0
+    for _ in range(repeat):
+        board = board_class(len(matrix))
+        board.load(matrix)
+        start = time.perf_counter()
+        nodes = search(board, depth, branch, 1)
+        elapsed = time.perf_counter() - start
+        best = max(best, nodes / elapsed)
+    return best, nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 11, 13])
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--branch", type=int, default=8)
+    parser.add_argument("--fill", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'N':>4} {'HexBoard nodos/s':>18} {'BitHexBoard nodos/s':>20} {'speedup':>8}")
+    for size in args.sizes:
+        matrix = random_board(size, int(size * size * args.fill), size, no_winner=True).board
+        base, base_nodes = measure(HexBoard, matrix, args.depth, args.branch, args.repeat)
+        bits, bits_nodes = measure(BitHexBoard, matrix, args.depth, args.branch, args.repeat)
+        if base_nodes != bits_nodes:
+            sys.exit(f"N={size}: HexBoard recorre {base_nodes} nodos y BitHexBoard {bits_nodes}")
+        print(f"{size:>4} {base:>18.0f} {bits:>20.0f} {bits / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
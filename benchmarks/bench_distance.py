@@ -0,0 +1,104 @@
+"""Motor de distancias (DistanceEngine) contra el A* de HexAIPlayer.
+
+Uso: python benchmarks/bench_distance.py [--sizes 5 7 9 11 13 15 17 19] [--positions 200]
+
+1. Comprueba en posiciones aleatorias que shortest_costs da el camino mínimo exacto del modelo
+   de costos de a_star (propia 0, vacía 1, rival 5), comparando con un Dijkstra de referencia.
+   Cuenta además en cuántas posiciones a_star se aleja del mínimo: su heurística (distancia
+   Manhattan) no es admisible en la rejilla hexagonal, así que puede devolver costos mayores.
+2. Mide la latencia por llamada (ambos jugadores) de a_star, shortest_costs y two_distances.
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from distance import DistanceEngine
+from hex_geometry import flat_neighbor_table, edge_cells, flatten
+from player import HexAIPlayer
+from common import random_board
+
+
+def reference_cost(grid: list, size: int, player_id: int) -> float:
+    """Dijkstra sin heurística sobre el mismo modelo de costos"""
+    neighbors = flat_neighbor_table(size)
+    first_edge, last_edge = edge_cells(size, player_id)
+    goal = set(last_edge)
+    dist = {}
+    heap = []
+    for index in first_edge:
+        if grid[index] != 3 - player_id:
+            heapq.heappush(heap, (0 if grid[index] == player_id else 1, index))
+    while heap:
+        cost, index = heapq.heappop(heap)
+        if index in dist:
+            continue
+        dist[index] = cost
+        if index in goal:
+            return cost
+        for neighbor in neighbors[index]:
+            if neighbor not in dist:
+                cell = grid[neighbor]
+                heapq.heappush(heap, (cost + (0 if cell == player_id else 1 if cell == 0 else 5), neighbor))
+    return math.inf
+
+
+def verify(size: int, positions: int, rng: random.Random) -> tuple:
+    engine = DistanceEngine(size)
+    ai = HexAIPlayer(1, math.inf)
+    inexact = 0
+    for _ in range(positions):
+        board = random_board(size, int(size * size * rng.random()), rng)
+        grid = flatten(board)
+        costs = engine.shortest_costs(grid)
+        for player_id in (1, 2):
+            expected = reference_cost(grid, size, player_id)
+            if costs[player_id - 1] != expected:
+                sys.exit(f"N={size} jugador {player_id}: {costs[player_id - 1]} != {expected}\n{board.board}")
+            if ai.a_star(board, player_id) != expected:
+                inexact += 1
+        potentials = engine.two_distances(grid)
+        for player_id in (1, 2):
+            if board.check_connection(player_id) != (potentials[player_id - 1] == 0):
+                sys.exit(f"N={size} jugador {player_id}: dos distancias {potentials[player_id - 1]} con conexión "
+                         f"{board.check_connection(player_id)}\n{board.board}")
+    return positions, inexact
+
+
+def latency(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 7, 9, 11, 13, 15, 17, 19])
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for size in args.sizes:
+        checked, inexact = verify(size, args.positions, rng)
+        print(f"N={size}: {checked} posiciones exactas; a_star por encima del mínimo en {inexact} de {2 * checked}")
+
+    print(f"{'N':>3} {'a_star x2 µs':>13} {'shortest µs':>12} {'dos dist. µs':>13} {'speedup':>8}")
+    for size in args.sizes:
+        ai = HexAIPlayer(1, math.inf)
+        engine = DistanceEngine(size)
+        board = random_board(size, size * size // 3, rng)
+        astar = latency(lambda: (ai.a_star(board, 1), ai.a_star(board, 2)), args.repeat)
+        shortest = latency(lambda: engine.shortest_costs(flatten(board)), args.repeat)
+        two = latency(lambda: engine.two_distances(flatten(board)), args.repeat)
+        print(f"{size:>3} {astar:>13.1f} {shortest:>12.1f} {two:>13.1f} {astar / shortest:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
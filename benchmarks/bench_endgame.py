@@ -0,0 +1,52 @@
+"""Finales con y sin el solucionador de conexiones virtuales (vc_solver).
+
+Uso: python benchmarks/bench_endgame.py [--sizes 7 9 11] [--positions 10] [--time 2]
+
+Para posiciones aleatorias avanzadas (la mitad del tablero ocupada, sin ganador todavía) se hace
+una jugada con use_vc_solver=False y True y se informa: tiempo medio por decisión, cuántas
+posiciones quedaron demostradas (victoria/derrota) y cuántas se restringieron a la región obligada.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from player import HexAIPlayer
+from vc_solver import WIN, LOSS, UNKNOWN
+from common import random_board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 9, 11])
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--time", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'N':>3} {'s sin solver':>13} {'s con solver':>13} {'victorias':>10} {'derrotas':>9} {'restringidas':>13}")
+    for size in args.sizes:
+        boards = [random_board(size, size * size // 2, rng, no_winner=True) for _ in range(args.positions)]
+        elapsed = [0.0, 0.0]
+        proven = {WIN: 0, LOSS: 0, UNKNOWN: 0}
+        restricted = 0
+        for board in boards:
+            for i, solver in enumerate((False, True)):
+                ai = HexAIPlayer(1 + len(board.history) % 2, args.time, use_vc_solver=solver)
+                start = time.perf_counter()
+                ai.play(board)
+                elapsed[i] += time.perf_counter() - start
+                if solver:
+                    proven[ai.proven] += 1
+                    moves = board.get_possible_moves()
+                    restricted += ai.proven == UNKNOWN and ai.prove(board, moves)[1] != moves
+        count = len(boards)
+        print(f"{size:>3} {elapsed[0] / count:>13.3f} {elapsed[1] / count:>13.3f} {proven[WIN]:>10} "
+              f"{proven[LOSS]:>9} {restricted:>13}")
+
+
+if __name__ == "__main__":
+    main()
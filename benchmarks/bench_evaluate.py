@@ -0,0 +1,145 @@
+"""Evaluación incremental (EvalState) contra la evaluación completa de HexAIPlayer.
+
+Uso: python benchmarks/bench_evaluate.py [--sizes 7 11 13] [--positions 200]
+
+1. Comprueba en posiciones aleatorias, jugando y deshaciendo con make_move/unmake_move, que
+   baseline_evaluate (el evaluate original, copiado abajo), full_evaluate e incremental_evaluate dan
+   exactamente el mismo valor (==, bit a bit: las tres suman los términos en el mismo orden).
+2. Mide la latencia por llamada de ambas, y la parte que no es A* (que se recalcula en las dos).
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from eval_state import EvalState
+from player import HexAIPlayer
+
+
+def baseline_evaluate(ai: HexAIPlayer, board: HexBoard) -> float:
+    """Copia de HexAIPlayer.evaluate antes de la evaluación incremental (referencia para verify)"""
+    size = board.size
+    score = 0
+    empty_cells = []
+
+    for row in range(size):
+        for col in range(size):
+            cell = board.board[row][col]
+            if cell == ai.player_id:
+                score += 10
+            elif cell == ai.opponent_id:
+                score -= 10
+            else:
+                empty_cells.append((row, col))
+
+    my_path_cost = ai.a_star(board, ai.player_id)
+    opp_path_cost = ai.a_star(board, ai.opponent_id)
+    if opp_path_cost <= 3:
+        score -= 300
+    if my_path_cost != math.inf:
+        score += 1000 / (1 + my_path_cost)
+    if opp_path_cost != math.inf:
+        score -= 1000 / (1 + opp_path_cost)
+
+    mid = size // 2
+    for (r, c) in empty_cells:
+        dist_center = abs(r - mid) + abs(c - mid)
+        centrality_bonus = max(0, (size - dist_center))
+        score += centrality_bonus * 0.5
+        friendly = 0
+        enemy = 0
+        for nr, nc in ai.neighbors(r, c, board):
+            neighbor = board.board[nr][nc]
+            if neighbor == ai.player_id:
+                friendly += 1
+            elif neighbor == ai.opponent_id:
+                enemy += 1
+        score += friendly * 1.5
+        score -= enemy * 1.5
+
+    for row in range(size):
+        for col in range(size):
+            cell = board.board[row][col]
+            if cell == ai.player_id:
+                if ai.opponent_id == 1:
+                    importance = col/size
+                    if col > 0 and col < size - 1:
+                        if (board.board[row][col - 1] == ai.opponent_id and
+                                board.board[row][col + 1] == ai.opponent_id):
+                            score += 30 + (importance*10)
+                else:
+                    importance = row/size
+                    if row > 0 and row < size - 1:
+                        if (board.board[row - 1][col] == ai.opponent_id and
+                                board.board[row + 1][col] == ai.opponent_id):
+                            score += 30 + (importance*10)
+
+    for chain in ai.find_chains(board, ai.player_id):
+        score += 50 * len(chain)
+    for chain in ai.find_chains(board, ai.opponent_id):
+        score -= 50 * len(chain)
+    return score
+
+
+def verify(size: int, positions: int, rng: random.Random) -> int:
+    checked = 0
+    for player_id in (1, 2):
+        ai = HexAIPlayer(player_id, math.inf)
+        board = HexBoard(size)
+        ai.eval_state = EvalState(board, player_id)
+        for _ in range(positions):
+            moves = board.get_possible_moves()
+            if moves and (not board.history or rng.random() < 0.7):
+                ai.make_move(board, rng.choice(moves), rng.randint(1, 2))
+            else:
+                ai.unmake_move(board)
+            baseline = baseline_evaluate(ai, board)
+            full = ai.full_evaluate(board)
+            incremental = ai.evaluate(board)
+            if not baseline == full == incremental:
+                sys.exit(f"N={size} jugador {player_id}: original {baseline}, completa {full}, "
+                         f"incremental {incremental}\n{board.board}")
+            checked += 1
+    return checked
+
+
+def latency(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 11, 13])
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for size in args.sizes:
+        print(f"N={size}: {verify(size, args.positions, rng)} posiciones coinciden")
+
+    print(f"{'N':>3} {'completa µs':>12} {'incremental µs':>15} {'A* µs':>8} {'resto completa':>15} {'resto incr.':>12}")
+    for size in args.sizes:
+        ai = HexAIPlayer(1, math.inf)
+        board = HexBoard(size)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(cells)
+        for i, (row, col) in enumerate(cells[:size * size // 3]):
+            board.place_piece(row, col, 1 + i % 2)
+        state = EvalState(board, 1)
+        full = latency(lambda: ai.full_evaluate(board), args.repeat)
+        incremental = latency(lambda: ai.incremental_evaluate(state), args.repeat)
+        path = latency(lambda: ai.add_path_terms(board, 0, 0), args.repeat)
+        print(f"{size:>3} {full:>12.1f} {incremental:>15.1f} {path:>8.1f} {full - path:>15.1f} {incremental - path:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Registros de partidas: tamaño en disco, lectura en streaming y análisis por lotes con caché.
+
+Uso: python benchmarks/bench_game_records.py [--games 20000] [--size 7] [--analyze 2000] [--workers 4]
+
+1. Escribe --games partidas aleatorias con GameRecorder (con aperturas repetidas para que haya
+   transposiciones) y mide bytes por jugada y velocidad de escritura y de lectura.
+2. Comprueba que read_games devuelve exactamente lo escrito.
+3. Analiza (evaluate) las posiciones de las primeras --analyze partidas en un pool de procesos y
+   muestra posiciones por segundo, cuántas salieron de la caché y la memoria máxima del proceso
+   antes y después del análisis (las partidas generadas ya están en memoria antes).
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from game_records import GameRecorder, analyze, read_games
+
+
+def random_game(size: int, rng: random.Random, openings: list) -> tuple:
+    """Partida al azar que empieza por una de unas pocas aperturas fijas"""
+    board = HexBoard(size)
+    moves = list(rng.choice(openings))
+    player_id = 1
+    for row, col in moves:
+        board.place_piece(row, col, player_id)
+        player_id = 3 - player_id
+    empty = board.get_possible_moves()
+    rng.shuffle(empty)
+    winner = 0
+    for row, col in empty:
+        board.place_piece(row, col, player_id)
+        moves.append((row, col))
+        if board.check_connection(player_id):
+            winner = player_id
+            break
+        player_id = 3 - player_id
+    return moves, winner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--analyze", type=int, default=2000, help="partidas a analizar")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cells = [(r, c) for r in range(args.size) for c in range(args.size)]
+    openings = [rng.sample(cells, 4) for _ in range(20)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "partidas.hexg")
+        games = [random_game(args.size, rng, openings) for _ in range(args.games)]
+        start = time.perf_counter()
+        recorder = GameRecorder(path)
+        for moves, winner in games:
+            recorder.start(args.size)
+            for row, col in moves:
+                recorder.move(row, col)
+            recorder.end(winner)
+        recorder.close()
+        written = time.perf_counter() - start
+        total = sum(len(moves) for moves, _ in games)
+        print(f"{args.games} partidas, {total} jugadas: {os.path.getsize(path) / total:.2f} bytes por jugada, "
+              f"escritura {total / written / 1e3:.0f} mil jugadas/s")
+
+        start = time.perf_counter()
+        for (size, moves, winner), (expected, expected_winner) in zip(read_games(path), games):
+            if size != args.size or moves != expected or winner != expected_winner:
+                sys.exit("read_games no devuelve lo escrito")
+        read = time.perf_counter() - start
+        print(f"lectura y verificación: {total / read / 1e3:.0f} mil jugadas/s")
+
+        subset = os.path.join(directory, "subset.hexg")
+        recorder = GameRecorder(subset)
+        for moves, winner in games[:args.analyze]:
+            recorder.start(args.size)
+            for row, col in moves:
+                recorder.move(row, col)
+            recorder.end(winner)
+        recorder.close()
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        start = time.perf_counter()
+        rows = cached = 0
+        for row in analyze([subset], workers=args.workers):
+            rows += 1
+            cached += row[-1]
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"análisis de {rows} posiciones en {elapsed:.1f} s ({rows / elapsed:.0f}/s), "
+              f"{cached} transposiciones desde la caché, memoria máxima {before:.0f} MB antes y {peak:.0f} MB después")
+
+
+if __name__ == "__main__":
+    main()
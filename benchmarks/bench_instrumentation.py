@@ -0,0 +1,70 @@
+"""Instrumentación de la búsqueda (SearchStats): costo con y sin instrument y ejemplo de log.
+
+Uso: python benchmarks/bench_instrumentation.py [--size 7] [--depth 3] [--repeat 5] [--every 2]
+
+1. Repite una búsqueda de profundidad fija (max_depth, sin límite de tiempo efectivo) con
+   instrument=False e instrument=True y compara el mejor tiempo y los nodos: sin instrumentación
+   play() va directo a la búsqueda, así que el costo debe ser nulo.
+2. Juega unas jugadas con stats_log y CProfileSampler y muestra una línea del log y el perfil.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from player import HexAIPlayer
+from search_stats import CProfileSampler
+from common import random_board
+
+
+def best_time(board: HexBoard, depth: int, repeat: int, **kwargs) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        ai = HexAIPlayer(1, 1000.0, max_depth=depth, **kwargs)
+        start = time.perf_counter()
+        ai.play(board)
+        best = min(best, time.perf_counter() - start)
+    return best, ai.nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--every", type=int, default=2, help="perfilar una de cada N jugadas")
+    args = parser.parse_args()
+
+    board = random_board(args.size, args.size * args.size // 4, 0, no_winner=True)
+    plain, plain_nodes = best_time(board, args.depth, args.repeat)
+    instrumented, nodes = best_time(board, args.depth, args.repeat, instrument=True)
+    print(f"N={args.size} profundidad {args.depth}: sin instrumentación {plain * 1000:.1f} ms "
+          f"({plain_nodes} nodos), con instrumentación {instrumented * 1000:.1f} ms ({nodes} nodos), "
+          f"{(instrumented / plain - 1) * 100:+.1f} %")
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = os.path.join(directory, "stats.jsonl")
+        sampler = CProfileSampler(every=args.every)
+        players = {1: HexAIPlayer(1, 0.3, stats_log=log, profiler=sampler),
+                   2: HexAIPlayer(2, 0.3)}
+        board = HexBoard(args.size)
+        current = 1
+        for _ in range(6):
+            row, col = players[current].play(board)
+            board.place_piece(row, col, current)
+            current = 3 - current
+        with open(log, encoding="utf-8") as lines:
+            records = [json.loads(line) for line in lines]
+        print(f"{len(records)} líneas en el log; la última:")
+        print(json.dumps(records[-1], indent=2, ensure_ascii=False))
+        print(f"jugadas perfiladas: {sampler.sampled}")
+        sampler.print_stats(limit=10)
+
+
+if __name__ == "__main__":
+    main()
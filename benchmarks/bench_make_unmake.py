@@ -0,0 +1,83 @@
+"""Asignaciones de memoria de la búsqueda: clone por hijo (antes) contra jugar/deshacer (después).
+
+Uso: python benchmarks/bench_make_unmake.py [--sizes 5 7] [--depth 2]
+
+Ambas variantes buscan la misma posición a profundidad fija y deben devolver el mismo
+valor y la misma jugada. Se reporta el pico de memoria de tracemalloc y las
+recolecciones de generación 0 del GC (una cada ~700 objetos contenedores asignados).
+"""
+import argparse
+import gc
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from player import HexAIPlayer
+from common import random_board
+
+
+class CloneSearchPlayer(HexAIPlayer):
+    """ Versión de referencia: cada hijo copia el tablero con clone() en lugar de deshacer la jugada.
+        Solo cambian make_move/unmake_move, así que la búsqueda es la misma de HexAIPlayer. minimax se
+        llama sin search, así que no hay EvalState y las dos variantes usan full_evaluate"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parents = []   # Copia del tablero antes de cada jugada en curso
+
+    def make_move(self, board, move, player_id):
+        self.parents.append(board.clone())
+        board.place_piece(*move, player_id)
+
+    def unmake_move(self, board):
+        parent = self.parents.pop()
+        parent.history = board.history[:-1]
+        board.__dict__.update(parent.__dict__)   # El mismo objeto vuelve a ser el tablero padre
+
+
+def measure(player_class, board: HexBoard, depth: int) -> dict:
+    ai = player_class(1, math.inf)
+    ai.clock.begin(len(board.get_possible_moves()))
+    collections = [0]
+
+    def on_gc(phase, info):
+        if phase == "start" and info["generation"] == 0:
+            collections[0] += 1
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    tracemalloc.start()
+    start = time.perf_counter()
+    score, move = ai.minimax(board.clone(), depth, -math.inf, math.inf, True)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.callbacks.remove(on_gc)
+    return {"score": score, "move": move, "peak": peak,
+            "gc0": collections[0], "time": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 7])
+    parser.add_argument("--depth", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'N':>3} {'variante':>14} {'pico KiB':>9} {'GC gen0':>8} {'tiempo s':>9}  resultado")
+    for size in args.sizes:
+        board = random_board(size, size, size)
+        before = measure(CloneSearchPlayer, board, args.depth)
+        after = measure(HexAIPlayer, board, args.depth)
+        for name, r in (("clone/hijo", before), ("jugar/deshacer", after)):
+            print(f"{size:>3} {name:>14} {r['peak'] / 1024:>9.1f} {r['gc0']:>8} "
+                  f"{r['time']:>9.2f}  {r['score']:.2f} {r['move']}")
+        if (before["score"], before["move"]) != (after["score"], after["move"]):
+            sys.exit("Los resultados de la búsqueda no coinciden")
+
+
+if __name__ == "__main__":
+    main()
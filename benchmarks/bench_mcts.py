@@ -0,0 +1,43 @@
+"""Simulaciones por segundo de MCTSPlayer y visitas reutilizadas entre turnos.
+
+Uso: python benchmarks/bench_mcts.py [--sizes 7 11 13] [--time 2]
+
+Para cada tamaño se juegan dos turnos de MCTSPlayer (con una respuesta del oponente
+elegida por el propio árbol) para mostrar también cuánto trabajo se conserva.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from mcts_player import MCTSPlayer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 11, 13])
+    parser.add_argument("--time", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'N':>3} {'simulaciones':>13} {'sim/s':>8} {'nodos':>9} {'visitas reutilizadas':>21}")
+    for size in args.sizes:
+        board = HexBoard(size)
+        ai = MCTSPlayer(1, args.time, seed=size)
+        move = ai.play(board)
+        board.place_piece(*move, 1)
+        # Respuesta del oponente: la más visitada en el subárbol actual
+        root = ai.root
+        first, count = ai.first_child[root], ai.child_count[root]
+        reply = max(range(first, first + count), key=lambda c: ai.visits[c]) if count else None
+        if reply is not None:
+            board.place_piece(*divmod(ai.move[reply], size + 1), 2)
+        else:
+            board.place_piece(*board.get_possible_moves()[0], 2)
+        ai.play(board)
+        print(f"{size:>3} {ai.playouts:>13} {ai.playouts_per_second:>8.0f} {len(ai.move):>9} {ai.reused_visits:>21}")
+
+
+if __name__ == "__main__":
+    main()
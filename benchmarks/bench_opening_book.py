@@ -0,0 +1,109 @@
+"""Libro de aperturas: construcción, simetrías y latencia de consulta.
+
+Uso: python benchmarks/bench_opening_book.py [--size 5] [--plies 1] [--time 0.5] [--synthetic 1000000]
+
+1. Construye en una carpeta temporal un libro pequeño con búsquedas reales y comprueba que cada
+   posición del libro y sus simétricas (giro de 180°, trasponer e intercambiar jugadores) devuelven
+   la misma jugada transformada.
+2. Escribe un libro sintético de --synthetic registros y mide el tiempo de apertura y la latencia
+   media de consulta con mmap + búsqueda binaria.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from opening_book import OpeningBook, book_path, build, opening_positions, transform, write_book
+from player import HexAIPlayer
+
+
+def transformed_board(board: HexBoard, symmetry: int) -> HexBoard:
+    """Aplica una simetría a la posición (las simetrías 2 y 3 intercambian los jugadores)"""
+    size = board.size
+    result = HexBoard(size)
+    for row, line in enumerate(board.board):
+        for col, cell in enumerate(line):
+            if cell:
+                r, c = transform((row, col), symmetry, size)
+                result.place_piece(r, c, cell if symmetry < 2 else 3 - cell)
+    return result
+
+
+def check_symmetries(directory: str, size: int, plies: int) -> int:
+    book = OpeningBook(book_path(directory, size))
+    checked = 0
+    for _, _, matrix, to_move in opening_positions(size, plies):
+        board = HexBoard(size)
+        board.load(matrix)
+        move = book.lookup(board, to_move)
+        if move is None:
+            sys.exit(f"posición sin jugada en el libro: {matrix}")
+        # Si la posición es simétrica en sí misma, cualquier imagen de la jugada por esa simetría vale
+        equivalent = {transform(move, symmetry, size) for symmetry in range(4)
+                      if symmetry < 2 and transformed_board(board, symmetry).board == board.board}
+        for symmetry in range(4):
+            image = transformed_board(board, symmetry)
+            image_to_move = to_move if symmetry < 2 else 3 - to_move
+            found = book.lookup(image, image_to_move)
+            if found is None or transform(found, symmetry, size) not in equivalent:
+                sys.exit(f"simetría {symmetry} inconsistente en {matrix}")
+            checked += 1
+    book.close()
+    return checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--plies", type=int, default=1)
+    parser.add_argument("--time", type=float, default=0.5)
+    parser.add_argument("--synthetic", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        entries = build(args.size, args.plies, args.time)
+        write_book(book_path(directory, args.size), args.size, entries)
+        print(f"libro N={args.size}, {args.plies} fichas: {len(entries)} posiciones canónicas "
+              f"en {time.perf_counter() - start:.1f} s")
+        print(f"{check_symmetries(directory, args.size, args.plies)} consultas simétricas coinciden")
+
+        ai = HexAIPlayer(1, 1.0, book_dir=directory)
+        start = time.perf_counter()
+        ai.play(HexBoard(args.size))
+        print(f"HexAIPlayer.play desde el libro: {(time.perf_counter() - start) * 1000:.2f} ms, "
+              f"book_hit={ai.book_hit}")
+
+        # Libro sintético grande: mide apertura y consultas
+        size = 11
+        rng = random.Random(0)
+        synthetic = {rng.getrandbits(64): (rng.randrange(size * size), 10) for _ in range(args.synthetic)}
+        path = book_path(directory, size)
+        write_book(path, size, synthetic)
+        start = time.perf_counter()
+        book = OpeningBook(path)
+        opened = time.perf_counter() - start
+        keys = rng.sample(list(synthetic), 10_000)
+        board = HexBoard(size)
+        board.place_piece(5, 5, 1)
+        start = time.perf_counter()
+        for key in keys:
+            assert book.find(key) == synthetic[key]
+        found = (time.perf_counter() - start) / len(keys)
+        start = time.perf_counter()
+        for _ in range(1000):
+            book.lookup(board, 2)
+        lookup = (time.perf_counter() - start) / 1000
+        book.close()
+        print(f"libro sintético de {args.synthetic} registros ({os.path.getsize(path) / 2**20:.1f} MB): "
+              f"apertura {opened * 1000:.2f} ms, find {found * 1e6:.1f} µs, "
+              f"lookup con canonización N={size} {lookup * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
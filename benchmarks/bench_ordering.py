@@ -0,0 +1,62 @@
+"""Nodos y tiempo para llegar a una profundidad fija: ordenamiento por evaluate() contra el ordenamiento barato.
+
+Uso: python benchmarks/bench_ordering.py [--sizes 5 7 9] [--depth 3] [--positions 3]
+
+"evaluate" reproduce el ordenamiento anterior (una evaluación completa por hijo);
+"barato" es el de HexAIPlayer: jugada de la tabla, asesinas, historia y patrones locales con PVS.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from player import HexAIPlayer
+from common import random_board
+
+
+class EvalOrderingPlayer(HexAIPlayer):
+    """Ordenamiento de referencia: cada hijo se ordena con una evaluación completa"""
+    def order_moves(self, board, moves, player_id, ply, tt_move):
+        maximizing = player_id == self.player_id
+        moves = sorted(moves, key=lambda m: self.evaluate_after_move(board, m, player_id), reverse=maximizing)
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        return moves
+
+
+def measure(player_class, board: HexBoard, depth: int) -> tuple:
+    ai = player_class(1, math.inf, max_depth=depth)
+    start = time.perf_counter()
+    move = ai.play(board)
+    return ai.nodes, time.perf_counter() - start, move
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 7, 9])
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--positions", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'N':>3} {'nodos evaluate':>15} {'s evaluate':>11} {'nodos barato':>13} {'s barato':>9} {'speedup':>8}")
+    for size in args.sizes:
+        totals = [0, 0.0, 0, 0.0]
+        for seed in range(args.positions):
+            board = random_board(size, size, seed)
+            nodes, elapsed, _ = measure(EvalOrderingPlayer, board, args.depth)
+            totals[0] += nodes
+            totals[1] += elapsed
+            nodes, elapsed, _ = measure(HexAIPlayer, board, args.depth)
+            totals[2] += nodes
+            totals[3] += elapsed
+        print(f"{size:>3} {totals[0]:>15} {totals[1]:>11.2f} {totals[2]:>13} {totals[3]:>9.2f} "
+              f"{totals[1] / totals[3]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
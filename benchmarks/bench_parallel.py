@@ -0,0 +1,53 @@
+"""Escalado de la búsqueda paralela en la raíz con 1/2/4/8 procesos.
+
+Uso: python benchmarks/bench_parallel.py [--size 7] [--depth 3] [--workers 1 2 4 8]
+
+Cada posición se busca hasta una profundidad fija sin límite de tiempo; el speedup es
+el tiempo con 1 proceso dividido por el tiempo con N. Los pools se crean antes de medir.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from parallel_player import ParallelHexAIPlayer
+from common import random_board
+
+
+def fixed_positions(size: int, count: int) -> list:
+    """Posiciones de prueba reproducibles (semilla fija)"""
+    return [random_board(size, size, seed) for seed in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--positions", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    print(f"{'procesos':>9} {'tiempo s':>9} {'speedup':>8}")
+    positions = fixed_positions(args.size, args.positions)
+    base = None
+    for workers in args.workers:
+        ai = ParallelHexAIPlayer(1, math.inf, workers=workers, max_depth=args.depth)
+        if workers > 1:
+            ai.play(HexBoard(3))    # Calentar el pool para no medir el arranque de los procesos
+        elapsed = 0.0
+        for board in positions:
+            start = time.perf_counter()
+            ai.play(board)
+            elapsed += time.perf_counter() - start
+        ai.close()
+        base = base or elapsed
+        print(f"{workers:>9} {elapsed:>9.2f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Pondering: profundidad alcanzada por jugada con y sin búsqueda en el tiempo del rival.
+
+Uso: python benchmarks/bench_pondering.py [--size 7] [--time 1] [--think 2] [--mode all] [--opponent-depth 2]
+
+El rival es un HexAIPlayer rápido (max_depth=--opponent-depth) que además "piensa" --think segundos con sleep,
+como un humano. En cada turno se detiene el pondering y, sobre la misma posición, juegan un
+HexAIPlayer normal (con su propia tabla conservada entre jugadas) y el PonderingHexAIPlayer, que es
+quien decide la partida. Se informa la profundidad media por jugada de ambos, la tasa de acierto
+del pondering y la latencia de parada.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from player import HexAIPlayer
+from pondering_player import PonderingHexAIPlayer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--time", type=float, default=1.0)
+    parser.add_argument("--think", type=float, default=2.0)
+    parser.add_argument("--mode", choices=["predicted", "all"], default="all")
+    parser.add_argument("--opponent-depth", type=int, default=2)
+    args = parser.parse_args()
+
+    plain = HexAIPlayer(1, args.time)
+    pondering = PonderingHexAIPlayer(1, args.time, mode=args.mode)
+    opponent = HexAIPlayer(2, 1.0, max_depth=args.opponent_depth)
+    board = HexBoard(args.size)
+    depths, hits, latencies = [], 0, []
+    current = 1
+    while not (board.check_connection(1) or board.check_connection(2)):
+        if current == 1:
+            if pondering.thread is not None:
+                pondering.stop_pondering()
+                latencies.append(pondering.stop_latency)
+            plain.play(board)
+            move = pondering.play(board)
+            depths.append((plain.depth_reached, pondering.depth_reached))
+            hits += pondering.ponder_hit
+        else:
+            time.sleep(args.think)  # Tiempo del rival: aquí es donde trabaja el pondering
+            move = opponent.play(board)
+        board.place_piece(*move, current)
+        current = 3 - current
+    pondering.close()
+
+    turns = len(depths)
+    print(f"{turns} jugadas; profundidad media sin pondering {sum(d[0] for d in depths) / turns:.2f}, "
+          f"con pondering ({args.mode}) {sum(d[1] for d in depths) / turns:.2f}; aciertos {hits}/{turns - 1}")
+    if latencies:
+        print(f"latencia de parada: media {sum(latencies) / len(latencies) * 1000:.1f} ms, "
+              f"máxima {max(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Poda de casillas inferiores (inferior_cells): nodos y profundidad con y sin poda.
+
+Uso: python benchmarks/bench_pruning.py [--sizes 7 9 11] [--positions 3] [--time 2]
+
+Para cada posición aleatoria (a medio jugar) se hace una jugada con time_limit fijo, con
+prune_inferior=False y True, y se informa la media de: casillas vacías, nodos por decisión,
+profundidad alcanzada y jugadas descartadas (raíz + nodos interiores).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+from player import HexAIPlayer
+from common import random_board
+
+
+def measure(board: HexBoard, time_limit: float, prune: bool) -> tuple:
+    ai = HexAIPlayer(1, time_limit, prune_inferior=prune)
+    moves = board.get_possible_moves()
+    ai.clock.begin(len(moves))
+    ai.search(board, moves)
+    ai.clock.finish()
+    return ai.nodes, ai.depth_reached, ai.pruned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 9, 11])
+    parser.add_argument("--positions", type=int, default=3)
+    parser.add_argument("--time", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'N':>3} {'poda':>5} {'vacías':>7} {'nodos/decisión':>15} {'profundidad':>12} {'descartadas':>12}")
+    for size in args.sizes:
+        boards = [random_board(size, size * size * 2 // 5, seed, no_winner=True) for seed in range(args.positions)]
+        empty = sum(len(board.get_possible_moves()) for board in boards) / len(boards)
+        for prune in (False, True):
+            results = [measure(board, args.time, prune) for board in boards]
+            nodes = sum(r[0] for r in results) / len(results)
+            depth = sum(r[1] for r in results) / len(results)
+            pruned = sum(r[2] for r in results) / len(results)
+            print(f"{size:>3} {'sí' if prune else 'no':>5} {empty:>7.1f} {nodes:>15.0f} {depth:>12.1f} {pruned:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
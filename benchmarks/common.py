@@ -0,0 +1,23 @@
+"""Utilidades compartidas por los benchmarks (no es un benchmark: no tiene main)."""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+
+
+def random_board(size: int, stones: int, rng, no_winner: bool = False) -> HexBoard:
+    """ Tablero con `stones` fichas en casillas al azar, alternando jugador 1 y 2.
+        rng es un random.Random o una semilla. Con no_winner se repite hasta que nadie haya conectado"""
+    if not isinstance(rng, random.Random):
+        rng = random.Random(rng)
+    while True:
+        board = HexBoard(size)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(cells)
+        for i, (row, col) in enumerate(cells[:stones]):
+            board.place_piece(row, col, 1 + i % 2)
+        if not no_winner or not (board.check_connection(1) or board.check_connection(2)):
+            return board
@@ -0,0 +1,127 @@
+"""Generador de carga para engine_server: cientos de partidas simultáneas contra el servidor.
+
+Uso: python benchmarks/load_engine_server.py [--games 200] [--connections 8] [--size 5] [--time 0.05]
+     [--workers 4] [--max-pending 32] [--worker-sessions 8] [--port 8765 | --unix /tmp/hex.sock] [--external]
+
+Sin --external levanta el servidor en el mismo proceso (el trabajo pesado va a sus procesos);
+con --external se conecta a uno ya lanzado con src/engine_server.py. Cada partida abre una sesión
+donde el motor lleva un color al azar y el cliente juega jugadas al azar con el otro. Las respuestas
+"overloaded" y "busy" (el proceso aún termina una búsqueda que ya no se esperaba) se reintentan con
+espera exponencial. Al final se muestran partidas por segundo, latencia vista por el cliente, errores
+y las métricas del servidor. Con --cancel se cancela una de
+cada N búsquedas justo después de pedirla, para ejercitar la cancelación.
+"""
+import argparse
+import asyncio
+import collections
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from engine_server import EngineClient, EngineServer, percentile
+
+
+async def engine_move(client: EngineClient, session: str, stats: dict, cancel_every: int, rng) -> dict:
+    """Pide la jugada del motor, reintentando si el servidor está saturado"""
+    backoff = 0.01
+    while True:
+        start = time.perf_counter()
+        request_id, future = client.send("play", session=session)
+        if cancel_every and rng.randrange(cancel_every) == 0:
+            await client.request("cancel", target=request_id)
+        response = await future
+        if response["ok"]:
+            stats["latencies"].append(time.perf_counter() - start)
+            return response
+        stats["errors"][response["error"]] += 1
+        if response["error"] not in ("overloaded", "cancelled", "deadline", "busy"):
+            raise RuntimeError(response["error"])
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 1.0)
+
+
+async def play_game(client: EngineClient, game: int, args, stats: dict):
+    rng = random.Random(game)
+    engine_id = rng.choice((1, 2))
+    response = await client.request("new", size=args.size, player=engine_id, time_limit=args.time)
+    if not response["ok"]:
+        stats["errors"][response["error"]] += 1
+        return
+    session = response["session"]
+    empty = {(r, c) for r in range(args.size) for c in range(args.size)}
+    current = 1
+    winner = None
+    while winner is None:
+        if current == engine_id:
+            response = await engine_move(client, session, stats, args.cancel, rng)
+            move = (response["row"], response["col"])
+        else:
+            move = rng.choice(sorted(empty))
+            response = await client.request("move", session=session, row=move[0], col=move[1])
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+        empty.discard(move)
+        winner = response["winner"]
+        current = 3 - current
+    await client.request("close", session=session)
+    stats["games"] += 1
+    stats["engine_wins"] += winner == engine_id
+
+
+async def run(args):
+    server = None
+    if not args.external:
+        server = EngineServer(workers=args.workers, max_pending=args.max_pending,
+                              max_in_flight=args.max_in_flight, worker_sessions=args.worker_sessions)
+        await server.start(port=args.port, unix=args.unix)
+    clients = []
+    for _ in range(args.connections):
+        client = EngineClient()
+        await client.connect(port=args.port, unix=args.unix)
+        clients.append(client)
+
+    stats = {"games": 0, "engine_wins": 0, "latencies": [], "errors": collections.Counter()}
+    start = time.perf_counter()
+    await asyncio.gather(*(play_game(clients[game % len(clients)], game, args, stats)
+                           for game in range(args.games)))
+    elapsed = time.perf_counter() - start
+    metrics = (await clients[0].request("metrics"))["metrics"]
+    for client in clients:
+        await client.close()
+    if server is not None:
+        await server.close()
+
+    latencies = stats["latencies"]
+    print(f"{stats['games']} partidas N={args.size} en {elapsed:.1f} s ({stats['games'] / elapsed:.1f}/s), "
+          f"{len(latencies)} jugadas del motor, el motor ganó {stats['engine_wins']}")
+    print(f"latencia del cliente: p50 {percentile(latencies, 0.5) * 1000:.0f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, máx {max(latencies) * 1000:.0f} ms")
+    print(f"respuestas no ok: {dict(stats['errors']) or 'ninguna'}")
+    print("métricas del servidor:")
+    for key, value in metrics.items():
+        print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--time", type=float, default=0.05, help="time_limit de cada jugada del motor")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-pending", type=int, default=32)
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--worker-sessions", type=int, default=8, help="jugadores que guarda cada proceso")
+    parser.add_argument("--cancel", type=int, default=0, help="cancelar una de cada N búsquedas (0 = ninguna)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None)
+    parser.add_argument("--external", action="store_true", help="usar un servidor ya lanzado")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
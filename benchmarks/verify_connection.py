@@ -0,0 +1,70 @@
+"""Regresión: check_connection (union-find incremental) contra el DFS original.
+
+Uso: python benchmarks/verify_connection.py [--positions 2000] [--seed 0]
+
+Juega partidas aleatorias y, tras cada jugada, compara ambos métodos para los dos
+jugadores. También deshace la partida con undo() y vuelve a comparar en cada paso, y comprueba
+que asignar board.board reconstruye las conexiones y el hash como load().
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from base_class_hexboard import HexBoard
+
+
+def compare(board: HexBoard) -> bool:
+    return all(board.check_connection(p) == board.check_connection_dfs(p) for p in (1, 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    checked = 0
+    for game in range(args.positions):
+        size = rng.randint(1, 11)
+        board = HexBoard(size)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(cells)
+        snapshots = []
+        for row, col in cells[:rng.randint(0, size * size)]:
+            board.place_piece(row, col, rng.randint(1, 2))   # Posiciones arbitrarias, no solo alternadas
+            snapshots.append([line[:] for line in board.board])
+            checked += 1
+            if not compare(board):
+                sys.exit(f"Diferencia tras colocar en la partida {game}: {board.board}")
+        # Deshacer todas las jugadas y verificar en cada estado intermedio
+        while board.history:
+            assert board.board == snapshots.pop()
+            board.undo()
+            checked += 1
+            if not compare(board):
+                sys.exit(f"Diferencia tras deshacer en la partida {game}: {board.board}")
+        # Reconstrucción desde una matriz (load) y copia (clone)
+        loaded = HexBoard(size)
+        loaded.load(board.board)
+        if not compare(loaded) or not compare(loaded.clone()):
+            sys.exit(f"Diferencia tras load/clone en la partida {game}")
+        # Asignar la matriz completa equivale a load (la propiedad board llama a load)
+        assigned = HexBoard(size)
+        assigned.board = board.board
+        if not compare(assigned) or assigned.hash != loaded.hash or assigned.board != board.board:
+            sys.exit(f"Diferencia tras asignar board en la partida {game}")
+
+    # El ejemplo de la revisión: fila superior completa del jugador 1 en un 3x3
+    board = HexBoard(3)
+    board.board = [[1, 1, 1], [0, 0, 0], [0, 0, 0]]
+    assert board.check_connection(1) and not board.check_connection(2)
+
+    print(f"OK: {checked} posiciones coinciden con el DFS de referencia")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,134 @@
+from union_find import UnionFind
+from zobrist import zobrist_keys
+from hex_geometry import neighbor_table
+
+
 class HexBoard:
     """ En esta clase se implementa el tablero y las funciones necesarias para su manejo"""
     def __init__(self, size: int):
         self.size = size  # Tamaño N del tablero (NxN)
-        self.board = [[0 for _ in range(size)] for _ in range(size)]  # Matriz NxN (0=vacío, 1=Jugador1, 2=Jugador2)
-         
+        self._board = [[0 for _ in range(size)] for _ in range(size)]  # Matriz NxN (0=vacío, 1=Jugador1, 2=Jugador2)
+        # Conjuntos disjuntos de casillas conectadas. Los nodos N*N..N*N+3 son los bordes virtuales:
+        # izquierda y derecha (Jugador1), arriba y abajo (Jugador2)
+        self.connections = UnionFind(size * size + 4)
+        self.history = []   # Jugadas colocadas: (fila, columna, marca del union-find antes de colocar)
+        self.hash = 0       # Hash de Zobrist de la posición, actualizado en cada jugada
+
+    @property
+    def board(self) -> list:
+        """ Matriz NxN (0=vacío, 1=Jugador1, 2=Jugador2), solo para leer: una casilla cambiada a mano
+            (board.board[r][c] = p) deja desactualizados connections, hash e history. Para cambiar fichas
+            están place_piece, undo y remove_piece; para reemplazar la matriz, load o asignar board"""
+        return self._board
+
+    @board.setter
+    def board(self, matrix: list):
+        # Asignar una matriz completa equivale a load: se reconstruyen las conexiones y el hash
+        self.load(matrix)
+
+    def edge_nodes(self, player_id: int) -> tuple:
+        """Devuelve los dos nodos virtuales de los bordes del jugador"""
+        n = self.size * self.size
+        return (n, n + 1) if player_id == 1 else (n + 2, n + 3)
+
     def clone(self) -> "HexBoard":
         """Devuelve una copia del tablero actual"""
-        board = HexBoard(self.size)
-        board.board = [row[:] for row in self.board]  # Hacer una copia profunda de cada fila
+        board = HexBoard.__new__(HexBoard)
+        board.size = self.size
+        board._board = [row[:] for row in self._board]  # Hacer una copia profunda de cada fila
+        board.connections = self.connections.copy()
+        board.history = []
+        board.hash = self.hash
         return board
 
+    def load(self, matrix: list):
+        """Reemplaza el contenido del tablero por una matriz NxN y reconstruye las conexiones"""
+        self._board = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        self.connections = UnionFind(self.size * self.size + 4)
+        self.history = []
+        self.hash = 0
+        for row in range(self.size):
+            for col in range(self.size):
+                if matrix[row][col] != 0:
+                    self.place_piece(row, col, matrix[row][col])
+        self.history = []
+
     def place_piece(self, row: int, col: int, player_id: int) -> bool:
         """Coloca una ficha si la casilla está vacía"""
-        if self.board[row][col] == 0:
-            self.board[row][col] = player_id
+        if self._board[row][col] == 0:
+            self._board[row][col] = player_id
+            self.history.append((row, col, self.connections.mark()))
+            self.hash ^= zobrist_keys(self.size)[(row * self.size + col) * 2 + player_id - 1]
+            self._connect(row, col, player_id)
             return True # Caso en que una casilla es colocada
         return False    # Caso en que una casilla no se pudo colocar
-        
+
+    def _connect(self, row: int, col: int, player_id: int):
+        """Une la nueva ficha con sus vecinas del mismo color y con los bordes que toca"""
+        size = self.size
+        index = row * size + col
+        board = self._board
+        union = self.connections.union
+        for nr, nc in neighbor_table(size)[index]:
+            if board[nr][nc] == player_id:
+                union(index, nr * size + nc)
+        first, last = self.edge_nodes(player_id)
+        line = col if player_id == 1 else row
+        if line == 0:
+            union(index, first)
+        if line == size - 1:
+            union(index, last)
+
+    def undo(self) -> tuple:
+        """Deshace la última jugada colocada con place_piece y devuelve su casilla"""
+        row, col, mark = self.history.pop()
+        self.hash ^= zobrist_keys(self.size)[(row * self.size + col) * 2 + self._board[row][col] - 1]
+        self._board[row][col] = 0
+        self.connections.rollback(mark)
+        return row, col
+
+    def remove_piece(self, row: int, col: int) -> bool:
+        """ Quita una ficha conservando la historia de las demás: se deshacen las jugadas posteriores,
+            se quita la ficha y se vuelven a colocar. Si es la última colocada cuesta O(1); si no está en la
+            historia (vino de load) se reconstruye la posición base"""
+        if self.board[row][col] == 0:
+            return False
+        later = []  # Jugadas posteriores a la ficha quitada, de la más reciente a la más antigua
+        while self.history and self.history[-1][:2] != (row, col):
+            r, c, _ = self.history[-1]
+            later.append((r, c, self.board[r][c]))
+            self.undo()
+        if self.history:
+            self.undo()
+        else:
+            matrix = [line[:] for line in self.board]
+            matrix[row][col] = 0
+            self.load(matrix)
+        for r, c, player_id in reversed(later):
+            self.place_piece(r, c, player_id)
+        return True
+
     def get_possible_moves(self) -> list:
         """Devuelve todas las casillas vacías como tuplas (fila, columna)"""
         result = []
+        board = self.board
         for i in range(self.size):
             for j in range (self.size):
-                if self.board[i][j] == 0:
+                if board[i][j] == 0:
                     result.append((i,j))
         return result
-   
+
     def check_connection(self, player_id: int) -> bool:
-        """Verifica si el jugador ha conectado sus dos lados"""
+        """Verifica si el jugador ha conectado sus dos lados (una consulta al union-find)"""
+        first, last = self.edge_nodes(player_id)
+        return self.connections.find(first) == self.connections.find(last)
+
+    def check_connection_dfs(self, player_id: int) -> bool:
+        """Verifica la conexión recorriendo el tablero con DFS (implementación de referencia)"""
 
         visited = [[False for _ in range(self.size)] for _ in range(self.size)] # Al inicio, ningún nodo ha sido visitado
         stack = []                                                              # Stack vacío
-
-        # Definiendo función de adyacencia para obtener vecinos
-        def get_neighbors(row, col):
-            directions = [(-1, 0), (1, 0), (-1, 1), (1, -1), (0, -1), (0, 1)]   # Direcciones válidas a conectar
-            dirs = directions
-
-            # Obteniendo vecinos
-            neighbors = []
-            for dr, dc in dirs:
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < self.size and 0 <= nc < self.size:
-                    neighbors.append((nr, nc))
-            return neighbors
+        neighbors = neighbor_table(self.size)
 
         # Empezar desde el borde correspondiente al jugador
         if player_id == 1:
@@ -67,8 +152,7 @@ class HexBoard:
             if player_id == 2 and r == self.size - 1:
                 return True  # Alcanzó el borde inferior
 
-            neighbors = get_neighbors(r, c)
-            for nr, nc in neighbors:
+            for nr, nc in neighbors[r * self.size + c]:
                 if not visited[nr][nc] and self.board[nr][nc] == player_id:
                     visited[nr][nc] = True
                     stack.append((nr, nc))
@@ -0,0 +1,103 @@
+from base_class_hexboard import HexBoard
+
+np = None    # numpy, asignado en BatchPlayoutEngine.__init__
+
+
+class BatchPlayoutEngine:
+    """ Simula miles de finales aleatorios de una posición a la vez como un array (batch, N, N).
+        Los ganadores se resuelven con propagación de etiquetas vectorizada sobre los tableros llenos
+        (en Hex no hay empates: con el tablero lleno gana quien conecte, y siempre conecta uno).
+        Sirve como motor de simulaciones para MCTSPlayer y como evaluación alternativa al A* de HexAIPlayer"""
+    def __init__(self, seed=None):
+        global np
+        try:
+            import numpy as np  # NumPy es opcional: se importa solo al crear el primer motor
+        except ImportError:
+            raise ImportError("BatchPlayoutEngine necesita NumPy (pip install numpy)") from None
+        self.rng = np.random.default_rng(seed)
+
+    def simulate(self, board: HexBoard, to_move: int, batch: int):
+        """Devuelve `batch` tableros llenos (int8, forma (batch, N, N)) completando la posición al azar"""
+        return self.fill(np.asarray(board.board, dtype=np.int8), to_move, batch)
+
+    def fill(self, base, to_move: int, batch: int):
+        """Completa una matriz NxN: cada fila del lote es un orden aleatorio de las casillas vacías
+           jugado alternando jugadores, es decir, un subconjunto aleatorio de ceil(k/2) casillas para to_move"""
+        size = base.shape[0]
+        flat = base.ravel()
+        empty = np.flatnonzero(flat == 0)
+        boards = np.repeat(flat[None, :], batch, axis=0)
+        k = len(empty)
+        if k:
+            ranks = self.rng.random((batch, k)).argsort(axis=1).argsort(axis=1)
+            boards[:, empty] = np.where(ranks < (k + 1) // 2, to_move, 3 - to_move).astype(np.int8)
+        return boards.reshape(batch, size, size)
+
+    def winners(self, boards):
+        """Ganador (1 o 2) de cada tablero lleno del lote"""
+        own = boards == 1
+        reached = np.zeros_like(own)
+        reached[:, :, 0] = own[:, :, 0]     # El jugador 1 parte del borde izquierdo
+        while True:
+            grown = reached.copy()
+            grown[:, 1:, :] |= reached[:, :-1, :]       # Vecino (-1, 0)
+            grown[:, :-1, :] |= reached[:, 1:, :]       # Vecino (1, 0)
+            grown[:, :, 1:] |= reached[:, :, :-1]       # Vecino (0, -1)
+            grown[:, :, :-1] |= reached[:, :, 1:]       # Vecino (0, 1)
+            grown[:, 1:, :-1] |= reached[:, :-1, 1:]    # Vecino (-1, 1)
+            grown[:, :-1, 1:] |= reached[:, 1:, :-1]    # Vecino (1, -1)
+            grown &= own
+            if np.array_equal(grown, reached):
+                break   # Ninguna región creció en todo el lote
+            reached = grown
+        return np.where(reached[:, :, -1].any(axis=1), 1, 2).astype(np.int8)
+
+    def statistics(self, board: HexBoard, to_move: int, batch: int = 1024) -> dict:
+        """ Simula `batch` finales y devuelve:
+              win_rate: fracción de victorias del jugador 1
+              ownership: (N, N) fracción de finales en que la casilla es del jugador 1
+              correlation: (N, N) correlación de Pearson entre tener la casilla y ganar (jugador 1);
+                           las casillas más críticas de la posición tienen la correlación más alta"""
+        boards = self.simulate(board, to_move, batch)
+        p1_wins = (self.winners(boards) == 1).astype(np.float64)
+        owned = (boards.reshape(batch, -1) == 1).astype(np.float64)
+        win_rate = p1_wins.mean()
+        ownership = owned.mean(axis=0)
+        covariance = (owned * p1_wins[:, None]).mean(axis=0) - ownership * win_rate
+        deviation = np.sqrt(ownership * (1 - ownership) * win_rate * (1 - win_rate))
+        correlation = np.divide(covariance, deviation, out=np.zeros_like(covariance), where=deviation > 0)
+        size = board.size
+        return {
+            "batch": batch,
+            "win_rate": float(win_rate),
+            "ownership": ownership.reshape(size, size),
+            "correlation": correlation.reshape(size, size),
+        }
+
+    def path_score(self, board: HexBoard, player_id: int, to_move: int, batch: int = 256) -> float:
+        """ Alternativa a los términos de A* de HexAIPlayer.evaluate: 1000 * (2p - 1), donde p es la
+            probabilidad estimada de que player_id gane; está en la misma escala que 1000 / (1 + costo)"""
+        winners = self.winners(self.simulate(board, to_move, batch))
+        p = float((winners == player_id).mean())
+        return 1000 * (2 * p - 1)
+
+    def rollout(self, size: int, bits1: int, bits2: int, to_move: int, batch: int) -> tuple:
+        """ Motor de simulaciones para MCTSPlayer, con posiciones en máscaras de bits (índice fila*(N+1)+col).
+            Devuelve (victorias del jugador 1, máscaras de un final de ejemplo para RAVE)"""
+        stride = size + 1
+        base = np.zeros((size, size), dtype=np.int8)
+        for row in range(size):
+            for col in range(size):
+                bit = 1 << (row * stride + col)
+                if bits1 & bit:
+                    base[row, col] = 1
+                elif bits2 & bit:
+                    base[row, col] = 2
+        boards = self.fill(base, to_move, batch)
+        wins1 = int((self.winners(boards) == 1).sum())
+        sample1 = sample2 = 0
+        for row, col in zip(*np.nonzero(boards[0] == 1)):
+            sample1 |= 1 << (int(row) * stride + int(col))
+        for row, col in zip(*np.nonzero(boards[0] == 2)):
+            sample2 |= 1 << (int(row) * stride + int(col))
+        return wins1, sample1, sample2
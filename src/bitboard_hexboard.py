@@ -0,0 +1,192 @@
+from itertools import compress
+
+from base_class_hexboard import HexBoard
+from zobrist import zobrist_keys, hash_matrix
+
+# Máscaras precalculadas por tamaño de tablero: {size: (valid, left, right, top, bottom)}
+_MASKS = {}
+_CELLS = {}     # {size: [(fila, col) de cada bit (None en la columna de relleno)]}
+_BIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")   # Dígitos de bin() a bytes 0/1 para compress
+
+
+def board_masks(size: int) -> tuple:
+    """Devuelve (y cachea) las máscaras de casillas válidas y de los cuatro bordes"""
+    masks = _MASKS.get(size)
+    if masks is None:
+        stride = size + 1   # Columna extra de relleno para que los desplazamientos no "den la vuelta"
+        valid = left = right = top = bottom = 0
+        for row in range(size):
+            for col in range(size):
+                bit = 1 << (row * stride + col)
+                valid |= bit
+                if col == 0:
+                    left |= bit
+                if col == size - 1:
+                    right |= bit
+                if row == 0:
+                    top |= bit
+                if row == size - 1:
+                    bottom |= bit
+        masks = (valid, left, right, top, bottom)
+        _MASKS[size] = masks
+    return masks
+
+
+def bit_cells(size: int) -> list:
+    """Devuelve (y cachea) la casilla (fila, col) de cada posición de bit"""
+    cells = _CELLS.get(size)
+    if cells is None:
+        stride = size + 1
+        cells = [divmod(bit, stride) if bit % stride < size else None for bit in range(size * stride)]
+        _CELLS[size] = cells
+    return cells
+
+
+def expand(mask: int, stride: int, valid: int) -> int:
+    """Devuelve las casillas vecinas (en las 6 direcciones) de las casillas de la máscara"""
+    # (0,±1) -> ±1, (±1,0) -> ±stride, (1,-1) -> +stride-1, (-1,1) -> -(stride-1)
+    diag = stride - 1
+    return ((mask << 1) | (mask >> 1) | (mask << stride) | (mask >> stride)
+            | (mask << diag) | (mask >> diag)) & valid
+
+
+def connects(own: int, size: int, player_id: int) -> bool:
+    """Indica si la máscara `own` une los dos lados del jugador (izquierda-derecha para 1, arriba-abajo para 2)"""
+    valid, left, right, top, bottom = board_masks(size)
+    start, goal = (left, right) if player_id == 1 else (top, bottom)
+    if not own & goal:
+        return False    # Sin fichas en el borde final no hace falta rellenar
+    stride = size + 1
+    reached = own & start
+    while reached:
+        if reached & goal:
+            return True
+        grown = reached | (expand(reached, stride, valid) & own)
+        if grown == reached:
+            break   # La región ya no crece: no hay conexión
+        reached = grown
+    return False
+
+
+class BitHexBoard(HexBoard):
+    """ Tablero alternativo que guarda una máscara de bits (int) por jugador.
+        La casilla (fila, col) corresponde al bit fila*(N+1)+col; la columna N es relleno.
+        Mantiene la API de HexBoard: board.board, place_piece, get_possible_moves, check_connection"""
+    def __init__(self, size: int):
+        self.size = size
+        self.stride = size + 1
+        self.bits1 = 0          # Fichas del jugador 1
+        self.bits2 = 0          # Fichas del jugador 2
+        self._matrix = None     # Vista NxN construida bajo demanda (ver propiedad board)
+        self.hash = 0           # Hash de Zobrist de la posición
+        self.history = []       # Jugadas colocadas (fila, columna), para undo
+
+    @property
+    def board(self) -> list:
+        """Matriz NxN (0=vacío, 1=Jugador1, 2=Jugador2) materializada a partir de las máscaras"""
+        if self._matrix is None:
+            stride = self.stride
+            b1, b2 = self.bits1, self.bits2
+            matrix = []
+            for row in range(self.size):
+                base = row * stride
+                line = []
+                for col in range(self.size):
+                    bit = 1 << (base + col)
+                    line.append(1 if b1 & bit else (2 if b2 & bit else 0))
+                matrix.append(line)
+            self._matrix = matrix
+        return self._matrix
+
+    @board.setter
+    def board(self, matrix: list):
+        # Permite asignar una matriz completa, como se hace con HexBoard
+        self.bits1 = self.bits2 = 0
+        stride = self.stride
+        for row, line in enumerate(matrix):
+            for col, cell in enumerate(line):
+                if cell == 1:
+                    self.bits1 |= 1 << (row * stride + col)
+                elif cell == 2:
+                    self.bits2 |= 1 << (row * stride + col)
+        self._matrix = None
+        self.hash = hash_matrix(matrix)
+        self.history = []
+
+    def load(self, matrix: list):
+        """Reemplaza el contenido del tablero por una matriz NxN"""
+        self.board = matrix
+
+    def clone(self) -> "BitHexBoard":
+        """Devuelve una copia del tablero actual (solo se copian los dos enteros)"""
+        board = BitHexBoard.__new__(BitHexBoard)
+        board.size = self.size
+        board.stride = self.stride
+        board.bits1 = self.bits1
+        board.bits2 = self.bits2
+        board._matrix = None
+        board.hash = self.hash
+        board.history = []
+        return board
+
+    def get_cell(self, row: int, col: int) -> int:
+        """Devuelve el contenido de una casilla sin construir la matriz"""
+        bit = 1 << (row * self.stride + col)
+        if self.bits1 & bit:
+            return 1
+        if self.bits2 & bit:
+            return 2
+        return 0
+
+    def place_piece(self, row: int, col: int, player_id: int) -> bool:
+        """Coloca una ficha si la casilla está vacía"""
+        bit = 1 << (row * self.stride + col)
+        if (self.bits1 | self.bits2) & bit:
+            return False
+        if player_id == 1:
+            self.bits1 |= bit
+        else:
+            self.bits2 |= bit
+        self.hash ^= zobrist_keys(self.size)[(row * self.size + col) * 2 + player_id - 1]
+        self.history.append((row, col))
+        if self._matrix is not None:
+            self._matrix[row][col] = player_id  # Mantener la vista sincronizada sin reconstruirla
+        return True
+
+    def undo(self) -> tuple:
+        """Deshace la última jugada colocada con place_piece y devuelve su casilla"""
+        row, col = self.history.pop()
+        self._clear(row, col)
+        return row, col
+
+    def remove_piece(self, row: int, col: int) -> bool:
+        """Quita una ficha (con máscaras el orden de las jugadas no importa)"""
+        if not self.get_cell(row, col):
+            return False
+        if (row, col) in self.history:
+            self.history.remove((row, col))
+        self._clear(row, col)
+        return True
+
+    def _clear(self, row: int, col: int):
+        bit = 1 << (row * self.stride + col)
+        player_id = 1 if self.bits1 & bit else 2
+        self.bits1 &= ~bit
+        self.bits2 &= ~bit
+        self.hash ^= zobrist_keys(self.size)[(row * self.size + col) * 2 + player_id - 1]
+        if self._matrix is not None:
+            self._matrix[row][col] = 0
+
+    def empty_mask(self) -> int:
+        """Máscara con las casillas vacías"""
+        return board_masks(self.size)[0] & ~(self.bits1 | self.bits2)
+
+    def get_possible_moves(self) -> list:
+        """Devuelve todas las casillas vacías como tuplas (fila, columna), en el mismo orden que HexBoard"""
+        # bin() da los bits del más significativo al menos: invertido, el carácter i es el bit i (por filas)
+        flags = bin(self.empty_mask())[:1:-1].encode().translate(_BIT_FLAGS)
+        return list(compress(bit_cells(self.size), flags))
+
+    def check_connection(self, player_id: int) -> bool:
+        """Verifica si el jugador ha conectado sus dos lados (relleno por desplazamientos de bits)"""
+        return connects(self.bits1 if player_id == 1 else self.bits2, self.size, player_id)
@@ -0,0 +1,159 @@
+import math
+
+from hex_geometry import flat_neighbor_table, edge_cells
+
+BUCKETS = 6     # Costo máximo de un paso (5) + 1: cubos circulares del algoritmo de Dial
+
+
+class DistanceEngine:
+    """ Distancias de conexión para los dos jugadores sobre tablas planas precalculadas (hex_geometry).
+        - shortest_costs: el modelo de costos de HexAIPlayer.a_star (propia 0, vacía 1, rival 5),
+          resuelto de forma exacta con una cola de cubos (Dial) en vez de un heap
+        - two_distances: la métrica de "dos distancias" de los programas de Hex (Queenbee/Hexy):
+          una casilla está a 1 + la segunda menor distancia de sus vecinas, porque el rival
+          siempre puede bloquear la mejor"""
+    def __init__(self, size: int):
+        self.size = size
+        self.cells = size * size
+        self.neighbors = flat_neighbor_table(size)
+        self.edges = {1: edge_cells(size, 1), 2: edge_cells(size, 2)}
+        self.goal = {}  # {jugador: bytearray con 1 en las casillas del borde final}
+        for player_id in (1, 2):
+            goal = bytearray(self.cells)
+            for index in self.edges[player_id][1]:
+                goal[index] = 1
+            self.goal[player_id] = goal
+
+    def shortest_costs(self, grid: list) -> tuple:
+        """Costo mínimo de unir los lados de (jugador 1, jugador 2)"""
+        return self.shortest_cost(grid, 1), self.shortest_cost(grid, 2)
+
+    def shortest_cost(self, grid: list, player_id: int) -> float:
+        """ Camino mínimo exacto con el algoritmo de Dial: los costos son enteros pequeños, así que la
+            cola de prioridad son BUCKETS listas circulares indexadas por costo % BUCKETS"""
+        neighbors = self.neighbors
+        goal = self.goal[player_id]
+        dist = [math.inf] * self.cells
+        ring = [[] for _ in range(BUCKETS)]
+        step = [1, 0, 0]                # Costo de entrar según el contenido (vacía, 1, 2)
+        step[3 - player_id] = 5
+        for index in self.edges[player_id][0]:
+            cell = grid[index]
+            if cell == 3 - player_id:
+                continue    # No se empieza sobre una ficha rival (igual que a_star)
+            dist[index] = step[cell]
+            ring[step[cell]].append(index)
+
+        cost = 0
+        idle = 0    # Cubos vacíos seguidos: BUCKETS vacíos seguidos = cola vacía
+        while idle < BUCKETS:
+            bucket = ring[cost % BUCKETS]
+            if not bucket:
+                idle += 1
+                cost += 1
+                continue
+            idle = 0
+            while bucket:
+                index = bucket.pop()
+                if dist[index] != cost:
+                    continue    # Entrada vieja: la casilla ya se alcanzó más barata
+                if goal[index]:
+                    return cost
+                for neighbor in neighbors[index]:
+                    new_cost = cost + step[grid[neighbor]]
+                    if new_cost < dist[neighbor]:
+                        dist[neighbor] = new_cost
+                        ring[new_cost % BUCKETS].append(neighbor)   # Peso 0: mismo cubo, se procesa ya
+            cost += 1
+        return math.inf
+
+    def two_distances(self, grid: list) -> tuple:
+        """Potencial de dos distancias de (jugador 1, jugador 2): min sobre casillas vacías de dA + dB"""
+        return self.two_distance_potential(grid, 1), self.two_distance_potential(grid, 2)
+
+    def two_distance_potential(self, grid: list, player_id: int) -> float:
+        links, start, goal, connected = self.contracted_graph(grid, player_id)
+        if connected:
+            return 0
+        from_start = self.two_distance_map(links, start)
+        from_goal = self.two_distance_map(links, goal)
+        return min((a + b for a, b in zip(from_start, from_goal)), default=math.inf)
+
+    def contracted_graph(self, grid: list, player_id: int) -> tuple:
+        """ Grafo de casillas vacías donde cada grupo de fichas propias se contrae: dos casillas vacías
+            son vecinas si se tocan o si tocan el mismo grupo. Las fichas rivales bloquean.
+            Devuelve (vecinas de cada casilla, casillas junto al borde inicial, junto al final, ya conectado)"""
+        n = self.cells
+        neighbors = self.neighbors
+        first_edge, last_edge = self.edges[player_id]
+        group = [-1] * n
+        liberties = []      # Casillas vacías vecinas de cada grupo
+        touches = []        # (toca borde inicial, toca borde final) de cada grupo
+        first_set, last_set = set(first_edge), set(last_edge)
+        for index in range(n):
+            if grid[index] == player_id and group[index] < 0:
+                label = len(liberties)
+                group[index] = label
+                stack = [index]
+                libs = set()
+                at_first = at_last = False
+                while stack:
+                    cell = stack.pop()
+                    at_first = at_first or cell in first_set
+                    at_last = at_last or cell in last_set
+                    for neighbor in neighbors[cell]:
+                        if grid[neighbor] == player_id and group[neighbor] < 0:
+                            group[neighbor] = label
+                            stack.append(neighbor)
+                        elif grid[neighbor] == 0:
+                            libs.add(neighbor)
+                liberties.append(libs)
+                touches.append((at_first, at_last))
+                if at_first and at_last:
+                    return None, None, None, True
+
+        links = [None] * n
+        start, goal = set(), set()
+        for index in range(n):
+            if grid[index] != 0:
+                continue
+            linked = set()
+            for neighbor in neighbors[index]:
+                cell = grid[neighbor]
+                if cell == 0:
+                    linked.add(neighbor)
+                elif cell == player_id:
+                    linked |= liberties[group[neighbor]]
+            linked.discard(index)
+            links[index] = linked
+            if index in first_set:
+                start.add(index)
+            if index in last_set:
+                goal.add(index)
+        for label, (at_first, at_last) in enumerate(touches):
+            if at_first:
+                start |= liberties[label]
+            if at_last:
+                goal |= liberties[label]
+        return links, start, goal, False
+
+    def two_distance_map(self, links: list, sources: set) -> list:
+        """Dos distancias desde un borde: las casillas junto al borde valen 1; el resto, 1 + la segunda menor vecina"""
+        dist = [math.inf] * self.cells
+        seen = [0] * self.cells     # Vecinas ya finalizadas de cada casilla
+        level = list(sources)
+        for index in level:
+            dist[index] = 1
+        value = 1
+        while level:
+            next_level = []
+            for index in level:
+                for neighbor in links[index]:
+                    if dist[neighbor] == math.inf:
+                        seen[neighbor] += 1
+                        if seen[neighbor] == 2:   # Segunda vecina alcanzada: su distancia queda fijada
+                            dist[neighbor] = value + 1
+                            next_level.append(neighbor)
+            level = next_level
+            value += 1
+        return [d for d, linked in zip(dist, links) if linked is not None]
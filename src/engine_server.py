@@ -0,0 +1,445 @@
+""" Servidor asyncio que atiende muchas partidas a la vez con un pool de procesos acotado.
+
+Uso:
+    python src/engine_server.py --port 8765 --workers 4 --engine player:HexAIPlayer \\
+        --engine-args '{"tt_megabytes": 16}' [--unix /tmp/hex.sock]
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea con el mismo "id"
+(las respuestas pueden llegar en otro orden). Operaciones:
+    {"id": 1, "op": "new", "size": 7, "player": 2, "time_limit": 1.0}  -> {"session": "..."}
+    {"id": 2, "op": "move", "session": "...", "row": 3, "col": 3}      -> {"winner": null}
+    {"id": 3, "op": "play", "session": "..."}                          -> {"row", "col", "winner", ...}
+    {"id": 4, "op": "cancel", "target": 3}
+    {"id": 5, "op": "close", "session": "..."}
+    {"id": 6, "op": "metrics"}
+Cada respuesta lleva "ok"; si es false, "error" dice por qué: "overloaded" (cola llena, reintentar
+más tarde), "deadline", "cancelled", "busy" (la sesión aún tiene un trabajo en su proceso, también
+después de un "deadline" o "cancelled" hasta que ese trabajo termine) u otro mensaje.
+
+Cada "play" tiene un plazo de time_limit + GRACE segundos desde que llega: lo que pase en la cola
+se descuenta del tiempo de búsqueda y, si el plazo vence antes de empezar, el proceso no busca.
+Cada sesión queda fija en un proceso (un pool de un solo proceso por shard, elegido al crear la sesión),
+así que ese proceso conserva su jugador entre jugadas (reloj, árbol de MCTS, tabla de transposición).
+Cada proceso guarda como mucho --worker-sessions jugadores (con su propia tabla: conviene ajustar
+tt_megabytes en --engine-args); si tiene más sesiones vivas, suelta las menos recientes y las reconstruye
+en su próxima jugada. Suelta el jugador cuando la sesión se cierra.
+Contrapresión: cada conexión tiene como mucho max_in_flight peticiones en curso (después se deja de
+leer el socket) y el servidor rechaza con "overloaded" cuando hay max_pending búsquedas pendientes.
+"""
+import argparse
+import asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import json
+import os
+import time
+
+from base_class_hexboard import HexBoard
+from tournament import load_class
+
+GRACE = 0.5             # Segundos extra sobre time_limit para la cola y la comunicación
+DEADLINE_MARGIN = 0.05  # Lo que el proceso reserva para devolver la jugada antes del plazo
+LATENCY_WINDOW = 1000   # Jugadas recientes con las que se calculan los percentiles
+WORKER_SESSIONS = 8     # Jugadores que guarda cada proceso por defecto (uno por sesión, los más recientes)
+CLOSED_WINDOW = 256     # Sesiones cerradas recientes que se avisan a los procesos con cada jugada
+
+# Jugadores que viven en cada proceso del pool, uno por sesión: el estado de una partida (reloj, árbol de
+# MCTS, pondering, tabla de transposición) no pasa a otra. Las sesiones cerradas llegan en `closed`
+_WORKER_PLAYERS = OrderedDict()
+
+
+def drop_player(session_id: str):
+    ai = _WORKER_PLAYERS.pop(session_id, None)
+    if ai is not None and hasattr(ai, "close"):
+        ai.close()
+
+
+def play_move(engine: str, engine_args: str, session_id: str, player_id: int, matrix: list, time_limit: float,
+              submitted: float, deadline: float, closed=(), worker_sessions=WORKER_SESSIONS):
+    """ Se ejecuta en un proceso del pool: una jugada con el tiempo que deje el plazo (hora absoluta).
+        Devuelve (jugada, segundos en cola, segundos de búsqueda, nodos), o None si el plazo venció en la cola"""
+    for old in closed:
+        drop_player(old)
+    started = time.time()
+    limit = min(time_limit, deadline - started - DEADLINE_MARGIN)
+    if limit <= 0:
+        return None
+    ai = _WORKER_PLAYERS.get(session_id)
+    if ai is None:
+        ai = load_class(engine)(player_id, time_limit, **json.loads(engine_args))
+        _WORKER_PLAYERS[session_id] = ai
+        while len(_WORKER_PLAYERS) > worker_sessions:
+            drop_player(next(iter(_WORKER_PLAYERS)))
+    _WORKER_PLAYERS.move_to_end(session_id)
+    # El límite de esta jugada vale para cualquier motor: time_limit (p. ej. MCTSPlayer) y el reloj si lo hay
+    ai.time_limit = limit
+    if hasattr(ai, "clock"):
+        ai.clock.move_limit = limit
+    board = HexBoard(len(matrix))
+    board.load(matrix)
+    move = ai.play(board)
+    nodes = getattr(ai, "move_nodes", getattr(ai, "nodes", None))    # move_nodes: sin lo sumado al pensar
+    return tuple(move), started - submitted, time.time() - started, nodes
+
+
+def percentile(values, fraction: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+class ServerMetrics:
+    """Contadores del servidor y latencias de las últimas LATENCY_WINDOW jugadas"""
+    def __init__(self):
+        self.requests = 0
+        self.completed = 0      # Jugadas del motor devueltas
+        self.rejected = 0       # Rechazadas por cola llena
+        self.timeouts = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)   # Desde que llega el "play" hasta la respuesta
+        self.queue_waits = deque(maxlen=LATENCY_WINDOW) # Desde el envío al pool hasta que un proceso empieza
+
+    def snapshot(self, sessions: int, pending: int, connections: int) -> dict:
+        return {
+            "sessions": sessions,
+            "pending": pending,
+            "connections": connections,
+            "requests": self.requests,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "latency_p50": percentile(self.latencies, 0.5),
+            "latency_p95": percentile(self.latencies, 0.95),
+            "latency_max": max(self.latencies, default=None),
+            "queue_wait_p50": percentile(self.queue_waits, 0.5),
+            "queue_wait_p95": percentile(self.queue_waits, 0.95),
+        }
+
+
+class Session:
+    """Una partida: el tablero, el jugador que lleva el motor y de quién es el turno"""
+    def __init__(self, session_id: str, size: int, player_id: int, time_limit: float):
+        self.id = session_id
+        self.board = HexBoard(size)
+        self.player_id = player_id
+        self.time_limit = time_limit
+        self.to_move = 1
+        self.winner = None
+        self.shard = 0          # Proceso del servidor que guarda el jugador de esta sesión
+        self.busy = False       # Hay un trabajo en el pool (aunque su "play" ya haya respondido)
+
+    def apply(self, row: int, col: int, player_id: int):
+        """Coloca una ficha del jugador al que le toca y devuelve el ganador (o None)"""
+        if self.winner is not None:
+            raise ValueError("la partida terminó")
+        if player_id != self.to_move:
+            raise ValueError(f"le toca al jugador {self.to_move}")
+        size = self.board.size
+        if not (0 <= row < size and 0 <= col < size) or not self.board.place_piece(row, col, player_id):
+            raise ValueError(f"jugada ilegal {row},{col}")
+        if self.board.check_connection(player_id):
+            self.winner = player_id
+        self.to_move = 3 - player_id
+        return self.winner
+
+
+class Connection:
+    """Estado de un cliente: sus sesiones, sus peticiones en curso y el candado de escritura"""
+    def __init__(self, writer, max_in_flight: int):
+        self.writer = writer
+        self.handler = asyncio.current_task()
+        self.write_lock = asyncio.Lock()
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.tasks = {}         # id de petición -> tarea
+        self.sessions = set()
+
+    async def send(self, response: dict):
+        async with self.write_lock:
+            self.writer.write(json.dumps(response).encode() + b"\n")
+            await self.writer.drain()
+
+
+class EngineServer:
+    """ Sesiones de partida sobre workers procesos (un ProcessPoolExecutor de un proceso cada uno, para que
+        cada sesión vuelva siempre al mismo). engine es "módulo:Clase" de un jugador con constructor
+        (player_id, time_limit, **engine_args)"""
+    def __init__(self, engine="player:HexAIPlayer", engine_args=None, workers=None, max_pending=64,
+                 max_in_flight=16, max_sessions=10000, max_time_limit=10.0, worker_sessions=WORKER_SESSIONS):
+        self.engine = engine
+        self.engine_args = json.dumps(engine_args or {}, sort_keys=True)
+        self.workers = workers or os.cpu_count() or 1
+        self.worker_sessions = worker_sessions
+        self.max_pending = max_pending
+        self.max_in_flight = max_in_flight
+        self.max_sessions = max_sessions
+        self.max_time_limit = max_time_limit
+        self.pools = []         # Un pool de un proceso por shard
+        self.server = None
+        self.sessions = {}
+        self.connections = set()
+        self.pending = 0        # Búsquedas enviadas a los pools que no han vuelto
+        # Sesiones terminadas de cada shard, para que su proceso suelte sus jugadores
+        self.closed = [deque(maxlen=CLOSED_WINDOW) for _ in range(self.workers)]
+        self.metrics = ServerMetrics()
+        self.ids = itertools.count(1)
+
+    async def start(self, host="127.0.0.1", port=8765, unix=None):
+        """Crea los pools y empieza a escuchar (en unix si se da una ruta, si no en host:port)"""
+        self.pools = [ProcessPoolExecutor(max_workers=1) for _ in range(self.workers)]
+        if unix is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, path=unix)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    async def close(self):
+        """Deja de aceptar clientes, cierra las conexiones abiertas y apaga los pools"""
+        if self.server is not None:
+            self.server.close()
+        connections = list(self.connections)
+        for connection in connections:
+            connection.writer.close()   # El lector ve el fin del socket y el manejador termina solo
+        await asyncio.gather(*(connection.handler for connection in connections), return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+        for pool in self.pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_client(self, reader, writer):
+        connection = Connection(writer, self.max_in_flight)
+        self.connections.add(connection)
+        try:
+            while True:
+                await connection.slots.acquire()    # Sin cupo se deja de leer: contrapresión por TCP
+                line = await reader.readline()
+                if not line:
+                    connection.slots.release()
+                    break
+                task = asyncio.ensure_future(self.serve(connection, line))
+                task.add_done_callback(lambda _: connection.slots.release())
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # El cliente se fue: se cancelan sus peticiones y se cierran sus sesiones
+            for task in list(connection.tasks.values()):
+                task.cancel()
+            for session_id in list(connection.sessions):
+                self.end_session(connection, session_id)
+            self.connections.discard(connection)
+            writer.close()
+
+    async def serve(self, connection: Connection, line: bytes):
+        """Atiende una petición y envía su respuesta"""
+        self.metrics.requests += 1
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+        except (ValueError, AttributeError):
+            self.metrics.errors += 1
+            await connection.send({"id": None, "ok": False, "error": "JSON inválido"})
+            return
+        if request_id is not None:
+            connection.tasks[request_id] = asyncio.current_task()
+        try:
+            response = await self.dispatch(connection, request)
+        except asyncio.CancelledError:
+            self.metrics.cancelled += 1
+            response = {"ok": False, "error": "cancelled"}
+        except (KeyError, TypeError, ValueError) as error:
+            self.metrics.errors += 1
+            response = {"ok": False, "error": str(error)}
+        finally:
+            connection.tasks.pop(request_id, None)
+        try:
+            await connection.send({"id": request_id, **response})
+        except ConnectionError:
+            pass
+
+    async def dispatch(self, connection: Connection, request: dict) -> dict:
+        op = request.get("op")
+        if op == "play":
+            return await self.play(self.session(connection, request))
+        if op == "move":
+            session = self.session(connection, request)
+            winner = session.apply(int(request["row"]), int(request["col"]), 3 - session.player_id)
+            return {"ok": True, "winner": winner}
+        if op == "new":
+            return self.new_session(connection, request)
+        if op == "close":
+            self.end_session(connection, self.session(connection, request).id)
+            return {"ok": True}
+        if op == "cancel":
+            task = connection.tasks.get(request["target"])
+            if task is not None:
+                task.cancel()
+            return {"ok": True, "found": task is not None}
+        if op == "metrics":
+            return {"ok": True, "metrics": self.metrics.snapshot(len(self.sessions), self.pending,
+                                                                 len(self.connections))}
+        raise ValueError(f"operación desconocida: {op}")
+
+    def session(self, connection: Connection, request: dict) -> Session:
+        session_id = request["session"]
+        if session_id not in connection.sessions:
+            raise KeyError(f"sesión desconocida: {session_id}")
+        return self.sessions[session_id]
+
+    def end_session(self, connection: Connection, session_id: str):
+        session = self.sessions.pop(session_id, None)
+        connection.sessions.discard(session_id)
+        if session is not None:
+            self.closed[session.shard].append(session_id)
+
+    def new_session(self, connection: Connection, request: dict) -> dict:
+        if len(self.sessions) >= self.max_sessions:
+            return {"ok": False, "error": "overloaded"}
+        size = int(request.get("size", 7))
+        player_id = int(request.get("player", 1))
+        if not 1 <= size <= 26 or player_id not in (1, 2):
+            raise ValueError("size o player inválidos")
+        time_limit = min(float(request.get("time_limit", 1.0)), self.max_time_limit)
+        number = next(self.ids)
+        session = Session(f"s{number}", size, player_id, time_limit)
+        session.shard = number % self.workers   # Reparto por turnos: las sesiones quedan equilibradas entre procesos
+        self.sessions[session.id] = session
+        connection.sessions.add(session.id)
+        return {"ok": True, "session": session.id}
+
+    async def play(self, session: Session) -> dict:
+        """Jugada del motor en el pool, con plazo time_limit + GRACE desde ahora"""
+        if session.busy:
+            return {"ok": False, "error": "busy"}
+        if session.winner is not None or session.to_move != session.player_id:
+            raise ValueError("no le toca al motor")
+        if self.pending >= self.max_pending:
+            self.metrics.rejected += 1
+            return {"ok": False, "error": "overloaded"}
+        start = time.perf_counter()
+        submitted = time.time()
+        deadline = submitted + session.time_limit + GRACE
+        session.busy = True
+        self.pending += 1
+        future = self.pools[session.shard].submit(
+            play_move, self.engine, self.engine_args, session.id, session.player_id, session.board.board,
+            session.time_limit, submitted, deadline, tuple(self.closed[session.shard]), self.worker_sessions)
+        # El cupo y la sesión se liberan cuando el trabajo termina de verdad, no cuando esta petición responde:
+        # si vence el plazo o se cancela con el trabajo ya en marcha, el proceso sigue ocupado hasta acabarlo
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self.release, session))
+        try:
+            # wait_for cancela el futuro del pool si vence el plazo o se cancela la petición
+            result = await asyncio.wait_for(asyncio.wrap_future(future), deadline - time.time())
+        except asyncio.TimeoutError:
+            result = None
+        if result is None:
+            self.metrics.timeouts += 1
+            return {"ok": False, "error": "deadline"}
+        (row, col), queue_wait, search, nodes = result
+        if session.id not in self.sessions:
+            raise KeyError(f"sesión cerrada: {session.id}")
+        winner = session.apply(row, col, session.player_id)
+        latency = time.perf_counter() - start
+        self.metrics.completed += 1
+        self.metrics.latencies.append(latency)
+        self.metrics.queue_waits.append(queue_wait)
+        return {"ok": True, "row": row, "col": col, "winner": winner, "latency": latency,
+                "queue_wait": queue_wait, "search": search, "nodes": nodes}
+
+    def release(self, session: Session):
+        """Llamado en el bucle cuando termina (o se cancela antes de empezar) el trabajo de una sesión"""
+        self.pending -= 1
+        session.busy = False
+
+
+class EngineClient:
+    """ Cliente asyncio del protocolo: varias peticiones a la vez sobre una conexión, emparejadas
+        con sus respuestas por id"""
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.waiting = {}       # id -> futuro de la respuesta
+        self.ids = itertools.count(1)
+        self.listener = None
+
+    async def connect(self, host="127.0.0.1", port=8765, unix=None):
+        if unix is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(unix)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.listener = asyncio.ensure_future(self.listen())
+
+    async def listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("conexión cerrada"))
+            self.waiting.clear()
+
+    def send(self, op: str, **fields) -> tuple:
+        """Envía una petición sin esperar; devuelve (id, futuro de la respuesta)"""
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(json.dumps({"id": request_id, "op": op, **fields}).encode() + b"\n")
+        return request_id, future
+
+    async def request(self, op: str, **fields) -> dict:
+        _, future = self.send(op, **fields)
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        if self.listener is not None:
+            await asyncio.gather(self.listener, return_exceptions=True)
+
+
+async def serve_forever(args):
+    server = EngineServer(args.engine, json.loads(args.engine_args), args.workers, args.max_pending,
+                          args.max_in_flight, args.max_sessions, args.max_time_limit, args.worker_sessions)
+    listener = await server.start(args.host, args.port, args.unix)
+    print(f"escuchando en {args.unix or f'{args.host}:{args.port}'} con {args.workers or 'todos los'} procesos")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de partidas de Hex (JSON lines sobre TCP o socket Unix)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="ruta de un socket Unix (en lugar de TCP)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--engine", default="player:HexAIPlayer", help="módulo:Clase del motor")
+    parser.add_argument("--engine-args", default="{}", help="argumentos del constructor (JSON)")
+    parser.add_argument("--max-pending", type=int, default=64, help="búsquedas pendientes antes de rechazar")
+    parser.add_argument("--max-in-flight", type=int, default=16, help="peticiones en curso por conexión")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--max-time-limit", type=float, default=10.0)
+    parser.add_argument("--worker-sessions", type=int, default=WORKER_SESSIONS,
+                        help="jugadores (y tablas de transposición) que guarda cada proceso")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
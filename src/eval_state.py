@@ -0,0 +1,201 @@
+import math
+
+from base_class_hexboard import HexBoard
+from hex_geometry import neighbor_table
+
+
+def exact_sum(score: float, spread: float) -> bool:
+    """ ¿Sumar a score, uno a uno, términos múltiplos de 0.5 cuyos valores absolutos suman spread da
+        siempre sumas parciales exactas? Entonces el orden no importa y basta una suma. Todas las sumas
+        parciales son múltiplos del ulp de score y caben en su binada si |score| + spread no llega a la siguiente"""
+    if score == 0:
+        return spread < 2 ** 52
+    exponent = math.frexp(score)[1]     # 2**(exponent-1) <= |score| < 2**exponent
+    return exponent <= 52 and abs(score) + spread < 2.0 ** exponent
+
+
+class EvalState:
+    """ Términos de HexAIPlayer.evaluate que se mantienen de forma incremental junto al tablero.
+        Cada ficha colocada o quitada solo cambia su casilla y sus vecinas, así que place/remove
+        actualizan en O(1):
+          - material: 10 por ficha propia, -10 por ficha rival
+          - centralidad: suma de max(0, N - distancia al centro) de las casillas vacías
+          - vecinos: pares (casilla vacía, ficha propia/rival vecina), en total y por casilla
+          - bloqueos: fichas propias entre dos rivales en la dirección del rival
+          - cadenas: un union-find propio (sin bordes virtuales, deshacible) con el tamaño y la primera
+            casilla de cada cadena, para recorrerlas en el orden de find_chains
+        Con los valores por casilla y por cadena, incremental_evaluate puede repetir las sumas de
+        full_evaluate en su mismo orden cuando el redondeo lo exige (ver exact_sum)"""
+    def __init__(self, board: HexBoard, player_id: int):
+        self.board = board
+        self.size = size = board.size
+        self.player_id = player_id
+        self.opponent_id = 2 if player_id == 1 else 1
+        self.neighbors = neighbor_table(size)
+        mid = size // 2
+        self.centrality = [max(0, size - (abs(r - mid) + abs(c - mid))) for r in range(size) for c in range(size)]
+        self.material = 0           # Diferencia de material (ya multiplicada por 10)
+        self.empty_count = 0
+        self.centrality_sum = 0     # Suma (entera) de la centralidad de las casillas vacías
+        self.friendly = 0           # Pares (vacía, vecina propia)
+        self.enemy = 0              # Pares (vacía, vecina rival)
+        self.friendly_at = [0] * (size * size)  # Fichas propias vecinas de cada casilla (vacía o no)
+        self.enemy_at = [0] * (size * size)     # Fichas rivales vecinas de cada casilla
+        self.blocks = {}            # Fichas propias que bloquean: {índice: bonificación}
+        # Cadenas: padre, tamaño y primera casilla (fila por fila) de cada raíz, raíces por jugador y,
+        # por cada ficha colocada, las uniones que hizo (raíz absorbida, raíz que la absorbió, su primera casilla)
+        self.parent = list(range(size * size))
+        self.chain_size = [1] * (size * size)
+        self.chain_first = list(range(size * size))
+        self.roots = {1: set(), 2: set()}
+        self.joins = []
+
+        grid = board.board
+        for row in range(size):
+            for col in range(size):
+                cell = grid[row][col]
+                if cell == self.player_id:
+                    self.material += 10
+                elif cell == self.opponent_id:
+                    self.material -= 10
+                else:
+                    self.empty_count += 1
+                    self.centrality_sum += self.centrality[row * size + col]
+                for nr, nc in self.neighbors[row * size + col]:
+                    if grid[nr][nc] == self.player_id:
+                        self.friendly_at[row * size + col] += 1
+                        self.friendly += cell == 0
+                    elif grid[nr][nc] == self.opponent_id:
+                        self.enemy_at[row * size + col] += 1
+                        self.enemy += cell == 0
+                if cell:
+                    self.join(row, col, cell)
+        self.joins = []     # Las fichas iniciales no se quitan nunca
+        for row in range(size):
+            for col in range(size):
+                self.update_block(row, col)
+
+    def place(self, row: int, col: int, player_id: int):
+        """Actualiza los términos después de colocar una ficha en el tablero"""
+        self._change(row, col, player_id, 1)
+
+    def remove(self, row: int, col: int, player_id: int):
+        """Actualiza los términos después de quitar una ficha de player_id del tablero"""
+        self._change(row, col, player_id, -1)
+
+    def _change(self, row: int, col: int, player_id: int, sign: int):
+        # sign = 1: la casilla pasa de vacía a ficha; sign = -1: de ficha a vacía
+        index = row * self.size + col
+        grid = self.board.board
+        own = player_id == self.player_id
+        self.material += sign * (10 if own else -10)
+        self.empty_count -= sign
+        self.centrality_sum -= sign * self.centrality[index]
+        # La casilla deja de (o vuelve a) ser una vacía con sus vecinas propias y rivales
+        self.friendly -= sign * self.friendly_at[index]
+        self.enemy -= sign * self.enemy_at[index]
+        counts = self.friendly_at if own else self.enemy_at
+        for nr, nc in self.neighbors[index]:
+            counts[nr * self.size + nc] += sign
+            if grid[nr][nc] == 0:
+                if own:
+                    self.friendly += sign     # Par nuevo (vecina vacía, esta ficha)
+                else:
+                    self.enemy += sign
+        if sign == 1:
+            self.join(row, col, player_id)
+        else:
+            self.split(index, player_id)
+        # Solo pueden cambiar los bloqueos de esta casilla y de sus dos vecinas en la dirección del rival
+        self.update_block(row, col)
+        if self.opponent_id == 1:
+            self.update_block(row, col - 1)
+            self.update_block(row, col + 1)
+        else:
+            self.update_block(row - 1, col)
+            self.update_block(row + 1, col)
+
+    def find(self, index: int) -> int:
+        parent = self.parent
+        while parent[index] != index:
+            index = parent[index]
+        return index
+
+    def join(self, row: int, col: int, player_id: int):
+        """Crea la cadena de una ficha nueva y la une con las cadenas vecinas del mismo jugador"""
+        size = self.size
+        index = row * size + col
+        grid = self.board.board
+        roots = self.roots[player_id]
+        roots.add(index)
+        joins = []
+        root = index
+        for nr, nc in self.neighbors[index]:
+            if grid[nr][nc] == player_id:
+                other = self.find(nr * size + nc)
+                if other != root and other in roots:    # Al construir, las vecinas posteriores aún no están
+                    if self.chain_size[root] < self.chain_size[other]:
+                        root, other = other, root
+                    joins.append((other, root, self.chain_first[root]))
+                    self.parent[other] = root       # La cadena menor cuelga de la mayor
+                    self.chain_size[root] += self.chain_size[other]
+                    self.chain_first[root] = min(self.chain_first[root], self.chain_first[other])
+                    roots.discard(other)
+        self.joins.append(joins)
+
+    def split(self, index: int, player_id: int):
+        """Deshace las uniones de la última ficha colocada (la que se quita)"""
+        roots = self.roots[player_id]
+        for other, root, first in reversed(self.joins.pop()):
+            self.parent[other] = other
+            self.chain_size[root] -= self.chain_size[other]
+            self.chain_first[root] = first
+            roots.add(other)
+        roots.discard(index)
+
+    def chain_sizes(self, player_id: int) -> list:
+        """Tamaños de las cadenas del jugador en el orden de find_chains (por su primera casilla)"""
+        first = self.chain_first
+        return [self.chain_size[root] for root in sorted(self.roots[player_id], key=first.__getitem__)]
+
+    def empty_terms(self) -> list:
+        """ (centralidad * 0.5, vecinas propias * 1.5, vecinas rivales * 1.5) de cada casilla vacía,
+            fila por fila, como los suma full_evaluate"""
+        terms = []
+        index = 0
+        for line in self.board.board:
+            for cell in line:
+                if cell == 0:
+                    terms.append((self.centrality[index] * 0.5, self.friendly_at[index] * 1.5,
+                                  self.enemy_at[index] * 1.5))
+                index += 1
+        return terms
+
+    def update_block(self, row: int, col: int):
+        """Recalcula la bonificación de bloqueo de una casilla (misma fórmula que evaluate)"""
+        size = self.size
+        if not (0 <= row < size and 0 <= col < size):
+            return
+        grid = self.board.board
+        opponent_id = self.opponent_id
+        bonus = None
+        if grid[row][col] == self.player_id:
+            if opponent_id == 1:
+                importance = col/size
+                if col > 0 and col < size - 1:
+                    if grid[row][col - 1] == opponent_id and grid[row][col + 1] == opponent_id:
+                        bonus = 30 + (importance*10)
+            else:
+                importance = row/size
+                if row > 0 and row < size - 1:
+                    if grid[row - 1][col] == opponent_id and grid[row + 1][col] == opponent_id:
+                        bonus = 30 + (importance*10)
+        index = row * size + col
+        if bonus is None:
+            self.blocks.pop(index, None)
+        else:
+            self.blocks[index] = bonus
+
+    def blocking_bonuses(self) -> list:
+        """Bonificaciones de bloqueo en el mismo orden (por filas) en que las suma evaluate"""
+        return [self.blocks[index] for index in sorted(self.blocks)]
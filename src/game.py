@@ -1,6 +1,8 @@
+import argparse
 import sys
 import time
 from base_class_hexboard import HexBoard
+from game_records import GameRecorder
 from base_class_player import Player
 from player import HexAIPlayer
 
@@ -45,14 +47,14 @@ def choose_players(): # Selección de jugador
     print("2. Jugador vs IA")
     print("3. IA vs Jugador")
     print("4. IA vs IA")
-    choice = input("Opción (1/2/3): ")
+    choice = input("Opción (1/2/3/4): ")
 
     if choice == "1":
-        return HumanPlayer(1,10), HumanPlayer(2,10)
+        return HumanPlayer(1), HumanPlayer(2)
     elif choice == "2":
-        return HumanPlayer(1,10), HexAIPlayer(2,10)
+        return HumanPlayer(1), HexAIPlayer(2,10)
     elif choice == "3":
-        return HexAIPlayer(1,10), HumanPlayer(2,10)
+        return HexAIPlayer(1,10), HumanPlayer(2)
     elif choice == "4":
         return HexAIPlayer(1,10), HexAIPlayer(2,10)
     else:
@@ -60,6 +62,10 @@ def choose_players(): # Selección de jugador
         sys.exit(1)
 
 def main():
+    parser = argparse.ArgumentParser(description="Partida de Hex en la consola")
+    parser.add_argument("--record", default=None, help="archivo .hexg donde agregar la partida")
+    args = parser.parse_args()
+
     try:
         size = int(input("Tamaño del tablero (recomendado 5-7): "))
         if size < 2:
@@ -72,6 +78,9 @@ def main():
     board = HexBoard(size)
     player1, player2 = choose_players()
     current_player = player1
+    recorder = GameRecorder(args.record) if args.record else None
+    if recorder:
+        recorder.start(size)
 
     print_board(board)
 
@@ -82,11 +91,16 @@ def main():
         if not success:
             print("Movimiento inválido, esa casilla ya está ocupada.")
             continue
+        if recorder:
+            recorder.move(move[0], move[1])
 
         print_board(board)
 
         if board.check_connection(current_player.player_id):
             print(f"Jugador {current_player.player_id} ha ganado el juego.")
+            if recorder:
+                recorder.end(current_player.player_id)
+                recorder.close()
             break
 
         current_player = player2 if current_player == player1 else player1
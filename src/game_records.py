@@ -0,0 +1,260 @@
+""" Registros binarios de partidas y análisis por lotes de todas sus posiciones.
+
+Análisis:
+    python src/game_records.py partidas.hexg registros/ --depth 2 --workers 4 --out analisis.csv
+
+Formato: MAGIC seguido de palabras u16 little-endian. Cada partida es
+    GAME_START, tamaño, casilla, casilla, ..., GAME_END, ganador
+donde casilla = fila * tamaño + columna. Los jugadores alternan empezando por el 1, así que la ficha
+no guarda de quién es. Una partida sin GAME_END (programa interrumpido) se lee con ganador 0.
+GameRecorder escribe cada jugada al momento, así que el archivo sirve también como registro de lo
+jugado si el proceso muere.
+
+El análisis recorre las partidas como generador, reparte las posiciones en bloques entre procesos y
+escribe cada fila en cuanto su bloque vuelve (en orden), con un número acotado de bloques en vuelo:
+la memoria no crece con el tamaño del archivo. Las transposiciones (misma posición y mismo jugador
+por mover) se resuelven con una caché LRU de hashes Zobrist y no se vuelven a evaluar.
+"""
+import argparse
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import math
+import os
+import sys
+
+from base_class_hexboard import HexBoard
+from zobrist import zobrist_keys, SIDE_KEY
+
+MAGIC = b"HEXGAME1"
+GAME_START = 0xFFFF
+GAME_END = 0xFFFE
+READ_BLOCK = 1 << 16    # Bytes leídos de una vez (par, para no partir palabras)
+EXTENSION = ".hexg"
+MAX_SIZE = 255          # Toda casilla (fila * tamaño + columna) cabe por debajo de GAME_END
+
+# Jugadores que viven en cada proceso del pool, uno por (jugador por mover, profundidad)
+_WORKER_PLAYERS = {}
+
+
+class GameRecorder:
+    """ Agrega partidas a un archivo de registros (lo crea con su cabecera si no existe).
+        Uso: start(tamaño), move(fila, columna) por cada ficha, end(ganador)"""
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.size = 0
+
+    def write(self, *words):
+        self.file.write(array("H", words).tobytes() if sys.byteorder == "little" else _swapped(words))
+        self.file.flush()
+
+    def start(self, size: int):
+        if not 1 <= size <= MAX_SIZE:
+            raise ValueError(f"tamaño de tablero inválido {size}")
+        self.size = size
+        self.write(GAME_START, size)
+
+    def move(self, row: int, col: int):
+        self.write(row * self.size + col)
+
+    def end(self, winner: int):
+        self.write(GAME_END, winner)
+
+    def close(self):
+        self.file.close()
+
+
+def _swapped(words) -> bytes:
+    data = array("H", words)
+    data.byteswap()
+    return data.tobytes()
+
+
+def read_words(path: str):
+    """Genera las palabras u16 del archivo leyendo por bloques"""
+    with open(path, "rb") as source:
+        if source.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es un archivo de partidas")
+        while True:
+            block = source.read(READ_BLOCK)
+            if not block:
+                return
+            words = array("H")
+            words.frombytes(block[:len(block) & ~1])
+            if sys.byteorder != "little":
+                words.byteswap()
+            yield from words
+
+
+def read_games(path: str):
+    """ Genera (tamaño, [(fila, columna), ...], ganador) por cada partida del archivo,
+        sin cargarlo entero en memoria"""
+    words = read_words(path)
+    size, moves = None, None
+    for word in words:
+        if word == GAME_START:
+            if size is not None:
+                yield size, moves, 0    # La partida anterior quedó sin terminar
+            size, moves = next(words, None), []
+            while size == GAME_START:   # GAME_START sin tamaño (cortado) seguido de otra partida
+                size = next(words, None)
+            if size is None:
+                return      # El archivo termina justo después de GAME_START
+            if not 1 <= size <= MAX_SIZE:
+                raise ValueError(f"{path}: tamaño de tablero inválido {size}")
+        elif word == GAME_END:
+            winner = next(words, 0)
+            if size is not None:
+                yield size, moves, winner
+            size, moves = None, None
+        elif size is not None:
+            moves.append(divmod(word, size))
+    if size is not None:
+        yield size, moves, 0
+
+
+def archive_paths(paths) -> list:
+    """Archivos de partidas dados directamente o dentro de carpetas (por extensión)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.endswith(EXTENSION))
+        else:
+            files.append(path)
+    return files
+
+
+def positions(paths):
+    """ Genera (partida, jugada, tamaño, casillas, jugador por mover, clave, jugada hecha) para cada
+        posición antes de cada jugada. casillas son bytes fila por fila y clave es (tamaño, hash Zobrist
+        de la posición y de quién mueve)"""
+    game = 0
+    for path in archive_paths(paths):
+        for size, moves, _ in read_games(path):
+            keys = zobrist_keys(size)
+            cells = bytearray(size * size)
+            value = 0
+            player_id = 1
+            for ply, (row, col) in enumerate(moves):
+                key = (size, value ^ SIDE_KEY if player_id == 2 else value)
+                yield game, ply, size, bytes(cells), player_id, key, (row, col)
+                index = row * size + col
+                if cells[index]:
+                    break   # Jugada ilegal: el resto de la partida no tiene sentido
+                cells[index] = player_id
+                value ^= keys[index * 2 + player_id - 1]
+                player_id = 3 - player_id
+            game += 1
+
+
+def analyze_chunk(chunk: list, depth: int) -> list:
+    """ Se ejecuta en un proceso del pool: (valor, mejor jugada) de cada (tamaño, casillas, jugador)
+        desde el punto de vista del que mueve. depth=0 usa evaluate; si no, una búsqueda a esa profundidad"""
+    from player import HexAIPlayer
+    results = []
+    for size, cells, player_id in chunk:
+        key = (player_id, depth)
+        ai = _WORKER_PLAYERS.get(key)
+        if ai is None:
+            ai = HexAIPlayer(player_id, math.inf, max_depth=depth or None)
+            _WORKER_PLAYERS[key] = ai
+        board = HexBoard(size)
+        board.load([cells[row * size:(row + 1) * size] for row in range(size)])
+        if depth == 0 or board.check_connection(1) or board.check_connection(2):
+            results.append((ai.evaluate(board), None))
+            continue
+        moves = board.get_possible_moves()
+        ai.clock.begin(len(moves), budget=math.inf)
+        move = ai.search(board, moves)
+        results.append((ai.iterations[-1][1] if ai.iterations else ai.evaluate(board), move))
+    return results
+
+
+def chunks(paths, chunk_size: int, cache: OrderedDict, cache_size: int):
+    """ Agrupa las posiciones en bloques de hasta chunk_size posiciones nuevas.
+        Genera (filas, trabajo): cada fila es (posición, índice de su resultado en el bloque o None si es
+        una transposición, celda). La celda es la lista [resultado] que comparten la caché y todas las filas
+        de esa posición: una fila no depende de que la clave siga en la caché cuando su bloque vuelve"""
+    rows, work = [], []
+    for position in positions(paths):
+        key = position[5]
+        cell = cache.get(key)
+        if cell is not None:
+            cache.move_to_end(key)
+            rows.append((position, None, cell))
+        else:
+            cell = cache[key] = [None]  # Pendiente hasta que vuelva su bloque
+            while len(cache) > cache_size:
+                cache.popitem(last=False)
+            rows.append((position, len(work), cell))
+            work.append((position[2], position[3], position[4]))
+            if len(work) == chunk_size:
+                yield rows, work
+                rows, work = [], []
+            continue
+        if len(rows) >= 4 * chunk_size:     # Muchas transposiciones seguidas: no acumular filas
+            yield rows, work
+            rows, work = [], []
+    if rows:
+        yield rows, work
+
+
+def analyze(paths, depth: int = 0, workers=None, chunk_size: int = 256, cache_size: int = 1 << 18):
+    """ Genera (partida, jugada, jugador, clave, jugada hecha, valor, mejor jugada, de_caché) en el orden
+        de los archivos. Como mucho 2 bloques por proceso en vuelo; la caché guarda cache_size claves"""
+    cache = OrderedDict()
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for rows, work in chunks(paths, chunk_size, cache, cache_size):
+            in_flight.append((rows, pool.submit(analyze_chunk, work, depth) if work else None))
+            if len(in_flight) >= window:
+                yield from resolve(*in_flight.popleft())
+        while in_flight:
+            yield from resolve(*in_flight.popleft())
+
+
+def resolve(rows: list, future):
+    """ Filas de un bloque terminado. Los bloques se resuelven en orden, así que la primera aparición
+        de cada transposición ya anotó su resultado en la celda"""
+    results = future.result() if future is not None else []
+    for _, index, cell in rows:
+        if index is not None:
+            cell[0] = results[index]
+    for (game, ply, _, _, player_id, key, played), index, cell in rows:
+        if cell[0] is None:
+            raise RuntimeError(f"partida {game}, jugada {ply}: posición sin resultado")
+        score, best = cell[0]
+        yield game, ply, player_id, key[1], played, score, best, index is None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiza todas las posiciones de archivos de partidas")
+    parser.add_argument("paths", nargs="+", help="archivos .hexg o carpetas que los contienen")
+    parser.add_argument("--depth", type=int, default=0, help="0 = evaluate; si no, búsqueda a esa profundidad")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=256, help="posiciones nuevas por bloque")
+    parser.add_argument("--cache", type=int, default=1 << 18, help="hashes recordados para las transposiciones")
+    parser.add_argument("--out", default=None, help="CSV de salida (por defecto, la salida estándar)")
+    args = parser.parse_args()
+
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(["game", "ply", "to_move", "hash", "played", "score", "best", "cached"])
+        for game, ply, player_id, key, played, score, best, cached in analyze(args.paths, args.depth, args.workers,
+                                                                               args.chunk, args.cache):
+            writer.writerow([game, ply, player_id, f"{key:016x}", f"{played[0]},{played[1]}", score,
+                             f"{best[0]},{best[1]}" if best else "", int(cached)])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
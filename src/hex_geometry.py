@@ -0,0 +1,70 @@
+DIRECTIONS = [(-1, 0), (1, 0), (-1, 1), (1, -1), (0, -1), (0, 1)]   # Direcciones válidas a conectar
+
+# Direcciones vecinas en orden circular; dos consecutivas forman un puente (su suma) con sus dos casillas intermedias
+RING = [(0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1), (1, 0)]
+
+# Tablas cacheadas por tamaño de tablero. Las casillas se indexan como fila*size+col
+_NEIGHBORS = {}         # {size: [[(fila, col), ...] por casilla]}
+_FLAT_NEIGHBORS = {}    # {size: [(índice, ...) por casilla]}
+_BRIDGES = {}           # {size: [[(puente, intermedia1, intermedia2), ...] por casilla]}
+_EDGES = {}             # {(size, player_id): (casillas del borde inicial, casillas del borde final)}
+
+
+def neighbor_table(size: int) -> list:
+    """Devuelve (y cachea) la lista de vecinos (fila, col) de cada casilla, indexada por fila*size+col"""
+    table = _NEIGHBORS.get(size)
+    if table is None:
+        table = []
+        for row in range(size):
+            for col in range(size):
+                table.append([(row + dr, col + dc) for dr, dc in DIRECTIONS
+                              if 0 <= row + dr < size and 0 <= col + dc < size])
+        _NEIGHBORS[size] = table
+    return table
+
+
+def flat_neighbor_table(size: int) -> list:
+    """Devuelve (y cachea) los vecinos de cada casilla como índices planos fila*size+col"""
+    table = _FLAT_NEIGHBORS.get(size)
+    if table is None:
+        table = [tuple(r * size + c for r, c in cells) for cells in neighbor_table(size)]
+        _FLAT_NEIGHBORS[size] = table
+    return table
+
+
+def bridge_table(size: int) -> list:
+    """Devuelve (y cachea) para cada casilla sus puentes: la casilla a distancia de puente y las dos intermedias"""
+    table = _BRIDGES.get(size)
+    if table is None:
+        table = []
+        for row in range(size):
+            for col in range(size):
+                bridges = []
+                for i in range(6):
+                    (ar, ac), (br, bc) = RING[i], RING[(i + 1) % 6]
+                    cells = ((row + ar + br, col + ac + bc), (row + ar, col + ac), (row + br, col + bc))
+                    if all(0 <= r < size and 0 <= c < size for r, c in cells):
+                        bridges.append(cells)
+                table.append(bridges)
+        _BRIDGES[size] = table
+    return table
+
+
+def edge_cells(size: int, player_id: int) -> tuple:
+    """Índices planos de los dos bordes del jugador: (izquierda, derecha) para 1, (arriba, abajo) para 2"""
+    edges = _EDGES.get((size, player_id))
+    if edges is None:
+        if player_id == 1:
+            edges = (tuple(r * size for r in range(size)), tuple(r * size + size - 1 for r in range(size)))
+        else:
+            edges = (tuple(range(size)), tuple((size - 1) * size + c for c in range(size)))
+        _EDGES[(size, player_id)] = edges
+    return edges
+
+
+def flatten(board) -> list:
+    """Contenido del tablero como lista plana (0 = vacía, 1 o 2)"""
+    flat = []
+    for row in board.board:
+        flat.extend(row)
+    return flat
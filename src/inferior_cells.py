@@ -0,0 +1,137 @@
+from hex_geometry import RING
+
+EDGE_UNKNOWN = 3    # Vecina fuera del tablero por dos lados (esquina): no cuenta como ningún color
+
+
+def _dead_fill(key: int) -> int:
+    """ Color con el que se puede rellenar una casilla muerta (0 si no está muerta). key codifica el color
+        de sus 6 vecinas en orden circular (RING), 2 bits por vecina. Patrones de casilla muerta:
+          - 4 o más vecinas consecutivas del mismo color
+          - 3 consecutivas de un color y las 3 opuestas del otro
+        En ambos casos cada vecina que la casilla podría unir ya es vecina de la cadena de ese color,
+        así que la casilla no le sirve a ningún jugador"""
+    ring = [(key >> (2 * k)) & 3 for k in range(6)]
+    for color in (1, 2):
+        if all(cell == color for cell in ring):
+            return color
+        for start in range(6):
+            run = 0
+            while run < 6 and ring[(start + run) % 6] == color:
+                run += 1
+            if run >= 4:
+                return color
+            if run == 3 and all(ring[(start + k) % 6] == 3 - color for k in range(3, 6)):
+                return color
+    return 0
+
+
+DEAD_FILL = bytes(_dead_fill(key) for key in range(4 ** 6))    # Tabla por código de vecindario
+
+
+class InferiorCells:
+    """ Análisis de casillas inferiores con patrones locales, para reducir las jugadas de la búsqueda:
+          - muertas: no le sirven a ningún jugador (DEAD_FILL)
+          - capturadas: pares de casillas vecinas x, y tales que si P ocupa una, la otra queda muerta;
+            P responde en la otra a cualquier intrusión, así que el par es suyo (se rellena con P)
+          - vulnerables: para el jugador que mueve, x es vulnerable a y si la respuesta rival en y deja
+            a x muerta; y domina a x y x se descarta (mientras y no se haya descartado también)
+        Los tableros se manejan como listas planas (índice fila*size+col) y los bordes cuentan como
+        fichas de su jugador (izquierda/derecha del 1, arriba/abajo del 2)"""
+    def __init__(self, size: int):
+        self.size = size
+        self.cells = size * size
+        self.ring = []      # Por casilla: 6 vecinas en orden circular (índice plano, o -color del borde)
+        self.slot = []      # Por casilla: {vecina: posición en el anillo}
+        for row in range(size):
+            for col in range(size):
+                ring, slot = [], {}
+                for k, (dr, dc) in enumerate(RING):
+                    r, c = row + dr, col + dc
+                    row_out, col_out = not 0 <= r < size, not 0 <= c < size
+                    if row_out and col_out:
+                        ring.append(-EDGE_UNKNOWN)
+                    elif col_out:
+                        ring.append(-1)
+                    elif row_out:
+                        ring.append(-2)
+                    else:
+                        ring.append(r * size + c)
+                        slot[r * size + c] = k
+                self.ring.append(tuple(ring))
+                self.slot.append(slot)
+
+    def key(self, grid: list, index: int) -> int:
+        """Código del vecindario de una casilla (entrada de DEAD_FILL)"""
+        key = 0
+        shift = 0
+        for neighbor in self.ring[index]:
+            key |= (grid[neighbor] if neighbor >= 0 else -neighbor) << shift
+            shift += 2
+        return key
+
+    def captured_by(self, grid: list, x: int, y: int) -> int:
+        """Jugador que captura el par de casillas vacías vecinas (x, y), o 0"""
+        key_x, key_y = self.key(grid, x), self.key(grid, y)
+        shift_x, shift_y = 2 * self.slot[x][y], 2 * self.slot[y][x]
+        for player_id in (1, 2):
+            if DEAD_FILL[key_x | player_id << shift_x] and DEAD_FILL[key_y | player_id << shift_y]:
+                return player_id
+        return 0
+
+    def fill_in(self, grid: list) -> tuple:
+        """ Rellena en el lugar las casillas muertas y capturadas hasta que no quede ninguna
+            (cada relleno puede crear otras). Devuelve (casillas muertas, casillas capturadas)"""
+        dead = captured = 0
+        pending = [index for index in range(self.cells) if grid[index] == 0]
+        while pending:
+            index = pending.pop()
+            if grid[index] != 0:
+                continue
+            filled = ()
+            color = DEAD_FILL[self.key(grid, index)]
+            if color:
+                grid[index] = color
+                filled = (index,)
+                dead += 1
+            else:
+                for neighbor in self.slot[index]:
+                    if grid[neighbor] == 0:
+                        color = self.captured_by(grid, index, neighbor)
+                        if color:
+                            grid[index] = grid[neighbor] = color
+                            filled = (index, neighbor)
+                            captured += 2
+                            break
+            for cell in filled:     # Las vecinas de lo rellenado se vuelven a revisar
+                pending.extend(n for n in self.slot[cell] if grid[n] == 0)
+        return dead, captured
+
+    def candidates(self, grid: list, moves: list, player_id: int) -> list:
+        """ Jugadas de moves ((fila, col), en el mismo orden) que no son muertas, capturadas ni
+            vulnerables para player_id. Si no quedara ninguna se devuelven todas"""
+        size = self.size
+        opponent_id = 3 - player_id
+        pruned = set()
+        keys = {}
+        for row, col in moves:
+            index = row * size + col
+            key = keys[index] = self.key(grid, index)
+            if DEAD_FILL[key]:
+                pruned.add(index)
+        for row, col in moves:
+            index = row * size + col
+            if index in pruned:
+                continue
+            key = keys[index]
+            for neighbor, k in self.slot[index].items():
+                if grid[neighbor] != 0 or neighbor in pruned:
+                    continue
+                if self.captured_by(grid, index, neighbor):
+                    pruned.add(index)
+                    pruned.add(neighbor)
+                    break
+                if DEAD_FILL[key | opponent_id << 2 * k]:     # Vulnerable: la respuesta rival en neighbor la mata
+                    pruned.add(index)
+                    break
+        kept = [move for move in moves if move[0] * size + move[1] not in pruned]
+        return kept or list(moves)
@@ -0,0 +1,276 @@
+from array import array
+import math
+import random
+import time
+
+from base_class_player import Player
+from base_class_hexboard import HexBoard
+from bitboard_hexboard import board_masks, connects
+
+
+class MCTSPlayer(Player):
+    """ Jugador de Monte Carlo Tree Search (UCT con RAVE).
+        El árbol se guarda en arrays paralelos (un índice por nodo) y los hijos de cada nodo son contiguos.
+        Las jugadas se identifican por el índice de bit fila*(N+1)+col, como en BitHexBoard.
+        Entre llamadas a play() se conserva el subárbol de la jugada que realmente se jugó"""
+    EXPLORATION = 0.3           # Constante de exploración de UCT
+    RAVE_EQUIVALENCE = 400      # Visitas a partir de las cuales el valor AMAF pesa la mitad (aprox.)
+    MAX_NODES = 2_000_000       # Tope de nodos: a partir de aquí solo se hacen simulaciones
+    CHECK_INTERVAL = 16         # Cada cuántas simulaciones se consulta el reloj
+
+    def __init__(self, player_id: int, time_limit, seed=None, batch_engine=None, batch_size=64):
+        super().__init__(player_id)
+        self.opponent_id = 2 if player_id == 1 else 1
+        self.time_limit = time_limit
+        self.batch_engine = batch_engine    # BatchPlayoutEngine opcional: batch_size simulaciones por hoja
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.playouts = 0           # Simulaciones de la última jugada
+        self.playouts_per_second = 0.0
+        self.reused_visits = 0      # Visitas heredadas del turno anterior en la última jugada
+        self.reset_tree()
+
+    def reset_tree(self):
+        """Descarta el árbol"""
+        self.size = 0
+        self.move = array("i")          # Jugada que lleva al nodo (-1 en la raíz)
+        self.parent = array("i")
+        self.first_child = array("i")   # Índice del primer hijo (-1 = sin expandir)
+        self.child_count = array("i")
+        self.visits = array("i")
+        self.wins = array("d")          # Victorias del jugador que hizo la jugada del nodo
+        self.rave_visits = array("i")
+        self.rave_wins = array("d")
+        self.winner = array("b")        # 0 = no terminal; si no, jugador que ya conectó
+        self.root = -1
+        self.root_bits = (0, 0)         # Posición de la raíz (máscaras de los jugadores 1 y 2)
+
+    def new_node(self, move: int, parent: int) -> int:
+        self.move.append(move)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.child_count.append(0)
+        self.visits.append(0)
+        self.wins.append(0.0)
+        self.rave_visits.append(0)
+        self.rave_wins.append(0.0)
+        self.winner.append(0)
+        return len(self.move) - 1
+
+    def play(self, board: HexBoard) -> tuple:
+        start = time.perf_counter()
+        deadline = start + max(self.time_limit - min(0.5, self.time_limit * 0.1), 0.01)   # Piso como TimeManager
+        size = board.size
+        bits1, bits2 = self.board_bits(board)
+        self.advance_root(size, bits1, bits2)
+        self.reused_visits = self.visits[self.root]
+
+        self.playouts = 0
+        while True:     # Al menos una simulación: la primera expande la raíz
+            if self.playouts and self.playouts % self.CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                break
+            self.playouts += self.simulate(size, bits1, bits2)
+        elapsed = time.perf_counter() - start
+        self.playouts_per_second = self.playouts / elapsed if elapsed > 0 else 0.0
+
+        # Elegir el hijo más visitado y dejarlo como raíz para el próximo turno
+        root = self.root
+        first, count = self.first_child[root], self.child_count[root]
+        best = max(range(first, first + count), key=lambda c: self.visits[c])
+        move = self.move[best]
+        if self.player_id == 1:
+            bits1 |= 1 << move
+        else:
+            bits2 |= 1 << move
+        self.compact(best)
+        self.root_bits = (bits1, bits2)
+        return divmod(move, size + 1)
+
+    def board_bits(self, board: HexBoard) -> tuple:
+        """Máscaras de bits (jugador 1, jugador 2) de un HexBoard cualquiera"""
+        if hasattr(board, "bits1"):
+            return board.bits1, board.bits2
+        stride = board.size + 1
+        bits = [0, 0, 0]
+        for row, line in enumerate(board.board):
+            for col, cell in enumerate(line):
+                if cell:
+                    bits[cell] |= 1 << (row * stride + col)
+        return bits[1], bits[2]
+
+    def advance_root(self, size: int, bits1: int, bits2: int):
+        """Reutiliza el subárbol de la jugada del oponente si la posición continúa la del turno anterior"""
+        if self.root >= 0 and size == self.size:
+            old1, old2 = self.root_bits
+            if old1 & ~bits1 == 0 and old2 & ~bits2 == 0:
+                added = (bits1 ^ old1) | (bits2 ^ old2)
+                opponent_bits = bits2 if self.opponent_id == 2 else bits1
+                if added == 0:
+                    return  # Misma posición: se sigue desde la raíz actual
+                if added & (added - 1) == 0 and added & opponent_bits:
+                    move = added.bit_length() - 1
+                    first, count = self.first_child[self.root], self.child_count[self.root]
+                    for child in range(first, first + count):
+                        if self.move[child] == move:
+                            self.compact(child)
+                            self.root_bits = (bits1, bits2)
+                            return
+        # No hay nada que reutilizar: árbol nuevo
+        self.reset_tree()
+        self.size = size
+        self.root = self.new_node(-1, -1)
+        self.root_bits = (bits1, bits2)
+
+    def compact(self, new_root: int):
+        """Copia el subárbol de new_root a arrays nuevos (descarta el resto del árbol)"""
+        old = (self.move, self.parent, self.first_child, self.child_count, self.visits,
+               self.wins, self.rave_visits, self.rave_wins, self.winner)
+        size = self.size
+        self.reset_tree()
+        self.size = size
+        o_move, _, o_first, o_count, o_visits, o_wins, o_rvisits, o_rwins, o_winner = old
+
+        def copy(index, parent):
+            node = self.new_node(o_move[index], parent)
+            self.visits[node] = o_visits[index]
+            self.wins[node] = o_wins[index]
+            self.rave_visits[node] = o_rvisits[index]
+            self.rave_wins[node] = o_rwins[index]
+            self.winner[node] = o_winner[index]
+            return node
+
+        self.root = copy(new_root, -1)
+        self.move[self.root] = -1
+        queue = [(new_root, self.root)]
+        while queue:
+            old_index, node = queue.pop()
+            count = o_count[old_index]
+            if count:
+                first = o_first[old_index]
+                self.first_child[node] = len(self.move)
+                self.child_count[node] = count
+                for k in range(count):
+                    queue.append((first + k, copy(first + k, node)))
+
+    def simulate(self, size: int, bits1: int, bits2: int) -> int:
+        """ Una iteración de MCTS: selección, expansión, simulación y retropropagación (con RAVE).
+            Devuelve el número de simulaciones hechas"""
+        player = self.player_id     # Jugador al que le toca en el nodo actual
+        node = self.root
+        path = [node]
+        # Selección
+        while self.child_count[node]:
+            node = self.select(node)
+            bit = 1 << self.move[node]
+            if player == 1:
+                bits1 |= bit
+            else:
+                bits2 |= bit
+            player = 3 - player
+            path.append(node)
+
+        # ¿La jugada que llevó a esta hoja ya ganó la partida?
+        winner = self.winner[node]
+        if not winner and node != self.root:
+            mover = 3 - player
+            if connects(bits1 if mover == 1 else bits2, size, mover):
+                winner = mover
+                self.winner[node] = mover
+
+        if not winner:
+            # Expansión: todos los hijos a la vez (contiguos) si la hoja ya se había visitado
+            if (self.visits[node] > 0 or node == self.root) and len(self.move) < self.MAX_NODES:
+                self.expand(node, size, bits1, bits2)
+                node = self.select(node)
+                bit = 1 << self.move[node]
+                if player == 1:
+                    bits1 |= bit
+                else:
+                    bits2 |= bit
+                player = 3 - player
+                path.append(node)
+            if self.batch_engine is not None:
+                wins1, bits1, bits2 = self.batch_engine.rollout(size, bits1, bits2, player, self.batch_size)
+                self.backpropagate(path, wins1, self.batch_size, bits1, bits2)
+                return self.batch_size
+            bits1, bits2, winner = self.playout(size, bits1, bits2, player)
+        else:
+            bits1, bits2, _ = self.playout(size, bits1, bits2, player)
+
+        self.backpropagate(path, 1 if winner == 1 else 0, 1, bits1, bits2)
+        return 1
+
+    def expand(self, node: int, size: int, bits1: int, bits2: int):
+        empty = board_masks(size)[0] & ~(bits1 | bits2)
+        self.first_child[node] = len(self.move)
+        count = 0
+        while empty:
+            low = empty & -empty
+            self.new_node(low.bit_length() - 1, node)
+            empty ^= low
+            count += 1
+        self.child_count[node] = count
+
+    def select(self, node: int) -> int:
+        """Elige el hijo con mayor valor UCT-RAVE"""
+        first = self.first_child[node]
+        log_n = math.log(self.visits[node] + 1)
+        visits, wins = self.visits, self.wins
+        rave_visits, rave_wins = self.rave_visits, self.rave_wins
+        k = self.RAVE_EQUIVALENCE
+        c = self.EXPLORATION
+        best, best_value = first, -math.inf
+        for child in range(first, first + self.child_count[node]):
+            n = visits[child]
+            rn = rave_visits[child]
+            q = wins[child] / n if n else 0.5
+            amaf = rave_wins[child] / rn if rn else 0.5
+            beta = math.sqrt(k / (3 * n + k))
+            value = (1 - beta) * q + beta * amaf + c * math.sqrt(log_n / (n + 1))
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    def playout(self, size: int, bits1: int, bits2: int, player: int) -> tuple:
+        """ Rellena al azar las casillas vacías alternando jugadores. En Hex no hay empates: con el tablero
+            lleno basta una comprobación de conexión para saber quién gana"""
+        empty = board_masks(size)[0] & ~(bits1 | bits2)
+        cells = []
+        while empty:
+            low = empty & -empty
+            cells.append(low)
+            empty ^= low
+        self.rng.shuffle(cells)
+        mine = 0
+        for bit in cells[0::2]:
+            mine |= bit
+        other = 0
+        for bit in cells[1::2]:
+            other |= bit
+        if player == 1:
+            bits1, bits2 = bits1 | mine, bits2 | other
+        else:
+            bits1, bits2 = bits1 | other, bits2 | mine
+        winner = 1 if connects(bits1, size, 1) else 2
+        return bits1, bits2, winner
+
+    def backpropagate(self, path: list, wins1: int, count: int, bits1: int, bits2: int):
+        """ Actualiza visitas/victorias del camino con `count` simulaciones (wins1 ganadas por el jugador 1)
+            y las estadísticas AMAF de los hijos de cada nodo a partir del final de ejemplo (bits1, bits2)"""
+        mover = self.opponent_id    # Quien "hizo" la jugada de la raíz
+        for node in path:
+            self.visits[node] += count
+            self.wins[node] += wins1 if mover == 1 else count - wins1
+            # Los hijos de este nodo son jugadas del otro jugador: cuentan para RAVE si ese jugador
+            # terminó ocupando la casilla en el resto de la partida
+            to_move = 3 - mover
+            child_count = self.child_count[node]
+            if child_count:
+                owned = bits1 if to_move == 1 else bits2
+                won = (wins1 if to_move == 1 else count - wins1) / count
+                first = self.first_child[node]
+                for child in range(first, first + child_count):
+                    if owned >> self.move[child] & 1:
+                        self.rave_visits[child] += 1
+                        self.rave_wins[child] += won
+            mover = to_move
@@ -0,0 +1,201 @@
+""" Libro de aperturas: jugadas precalculadas con búsquedas profundas, en un archivo binario por tamaño.
+
+Construcción (fuera de línea):
+    python src/opening_book.py --size 7 --plies 2 --time 10 --out books
+
+Formato: cabecera MAGIC + tamaño (u16) + cantidad (u32), seguida de registros de RECORD
+(clave u64, jugada u16, profundidad u16) ordenados por clave. La clave es el hash Zobrist canónico
+de la posición y del jugador que mueve; la jugada está en el marco canónico.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+import struct
+
+from base_class_hexboard import HexBoard
+from zobrist import zobrist_keys, SIDE_KEY
+
+MAGIC = b"HEXBOOK1"
+HEADER = struct.Struct("<8sHI")
+RECORD = struct.Struct("<QHH")
+
+
+def book_path(directory: str, size: int) -> str:
+    return os.path.join(directory, f"hex{size}.book")
+
+
+def symmetric_keys(board: HexBoard, to_move: int) -> list:
+    """ Hashes de la posición bajo las 4 simetrías de Hex, en este orden:
+          0: identidad, 1: giro de 180°, 2: trasponer e intercambiar jugadores, 3: ambas
+        (las dos últimas cambian también quién mueve)"""
+    size = board.size
+    keys = zobrist_keys(size)
+    last = size - 1
+    h = [0, 0, 0, 0]
+    for row, line in enumerate(board.board):
+        for col, cell in enumerate(line):
+            if cell:
+                other = 2 - cell    # (3 - cell) - 1
+                h[0] ^= keys[(row * size + col) * 2 + cell - 1]
+                h[1] ^= keys[((last - row) * size + last - col) * 2 + cell - 1]
+                h[2] ^= keys[(col * size + row) * 2 + other]
+                h[3] ^= keys[((last - col) * size + last - row) * 2 + other]
+    if to_move == 2:
+        h[0] ^= SIDE_KEY
+        h[1] ^= SIDE_KEY
+    else:
+        h[2] ^= SIDE_KEY
+        h[3] ^= SIDE_KEY
+    return h
+
+
+def transform(move: tuple, symmetry: int, size: int) -> tuple:
+    """Aplica una simetría a una casilla (cada simetría es su propia inversa)"""
+    row, col = move
+    last = size - 1
+    if symmetry == 1:
+        return last - row, last - col
+    if symmetry == 2:
+        return col, row
+    if symmetry == 3:
+        return last - col, last - row
+    return row, col
+
+
+def canonical(board: HexBoard, to_move: int) -> tuple:
+    """(clave canónica, simetría que lleva la posición al marco canónico)"""
+    keys = symmetric_keys(board, to_move)
+    symmetry = min(range(4), key=keys.__getitem__)
+    return keys[symmetry], symmetry
+
+
+class OpeningBook:
+    """ Lectura de un libro con mmap y búsqueda binaria: no se carga el archivo en memoria,
+        el sistema operativo solo trae las páginas que tocan las búsquedas"""
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es un libro de aperturas")
+
+    def find(self, key: int):
+        """(jugada canónica, profundidad) de la clave, o None"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, move, depth = RECORD.unpack_from(self.data, HEADER.size + middle * RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return move, depth
+        return None
+
+    def lookup(self, board: HexBoard, to_move: int):
+        """Jugada del libro para la posición (en el marco del tablero), o None"""
+        if board.size != self.size:
+            return None
+        key, symmetry = canonical(board, to_move)
+        found = self.find(key)
+        if found is None:
+            return None
+        move = transform(divmod(found[0], self.size), symmetry, self.size)
+        return move if board.board[move[0]][move[1]] == 0 else None
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+def write_book(path: str, size: int, entries: dict):
+    """Escribe {clave canónica: (jugada canónica, profundidad)} ordenado por clave"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, size, len(entries)))
+        for key in sorted(entries):
+            move, depth = entries[key]
+            out.write(RECORD.pack(key, move, depth))
+
+
+def search_position(size: int, matrix: list, to_move: int, time_limit: float, max_depth) -> tuple:
+    """ Se ejecuta en un proceso del pool: búsqueda profunda de una posición.
+        Devuelve (jugada, profundidad alcanzada)"""
+    from player import HexAIPlayer
+    board = HexBoard(size)
+    board.load(matrix)
+    ai = HexAIPlayer(to_move, time_limit, max_depth=max_depth)
+    move = ai.play(board)
+    return move, ai.depth_reached
+
+
+def opening_positions(size: int, plies: int) -> list:
+    """ Posiciones canónicas distintas con hasta `plies` fichas (empieza el jugador 1).
+        Devuelve [(clave, simetría, matriz, jugador que mueve)]"""
+    positions = []
+    seen = set()
+    level = [HexBoard(size)]
+    for ply in range(plies + 1):
+        to_move = 1 if ply % 2 == 0 else 2
+        next_level = []
+        for board in level:
+            key, symmetry = canonical(board, to_move)
+            if key in seen:
+                continue
+            seen.add(key)
+            positions.append((key, symmetry, [line[:] for line in board.board], to_move))
+            if ply < plies:
+                for row, col in board.get_possible_moves():
+                    child = board.clone()
+                    child.place_piece(row, col, to_move)
+                    next_level.append(child)
+        level = next_level
+    return positions
+
+
+def build(size: int, plies: int, time_limit: float, max_depth=None, workers=None, existing=None) -> dict:
+    """Busca cada posición de apertura en paralelo y devuelve las entradas del libro"""
+    entries = dict(existing or {})
+    pending = [position for position in opening_positions(size, plies) if position[0] not in entries]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(search_position, size, matrix, to_move, time_limit, max_depth)
+                   for _, _, matrix, to_move in pending]
+        for (key, symmetry, _, _), future in zip(pending, futures):
+            move, depth = future.result()
+            row, col = transform(move, symmetry, size)   # Al marco canónico
+            entries[key] = (row * size + col, depth)
+    return entries
+
+
+def read_entries(path: str) -> dict:
+    """Entradas de un libro existente (para ampliarlo)"""
+    book = OpeningBook(path)
+    entries = {}
+    for index in range(book.count):
+        key, move, depth = RECORD.unpack_from(book.data, HEADER.size + index * RECORD.size)
+        entries[key] = (move, depth)
+    book.close()
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye un libro de aperturas para un tamaño de tablero")
+    parser.add_argument("--size", type=int, required=True)
+    parser.add_argument("--plies", type=int, default=1, help="fichas máximas de las posiciones del libro")
+    parser.add_argument("--time", type=float, default=10.0, help="segundos de búsqueda por posición")
+    parser.add_argument("--depth", type=int, default=None, help="profundidad máxima por posición")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="books")
+    args = parser.parse_args()
+
+    path = book_path(args.out, args.size)
+    existing = read_entries(path) if os.path.exists(path) else None
+    entries = build(args.size, args.plies, args.time, args.depth, args.workers, existing)
+    write_book(path, args.size, entries)
+    print(f"{path}: {len(entries)} posiciones")
+
+
+if __name__ == "__main__":
+    main()
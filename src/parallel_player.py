@@ -0,0 +1,103 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from base_class_hexboard import HexBoard
+from player import HexAIPlayer
+
+POOL_MARGIN = 0.05  # Segundos reservados para enviar los trabajos al pool y recoger sus resultados
+
+# Jugadores que viven en cada proceso del pool, para conservar su tabla de transposición entre jugadas
+_WORKER_PLAYERS = {}
+
+
+def search_subset(player_id: int, matrix: list, moves: list, budget: float, options: tuple) -> tuple:
+    """ Se ejecuta en un proceso del pool: profundización iterativa solo sobre las jugadas de raíz dadas.
+        options son los argumentos de HexAIPlayer que afectan a la búsqueda, como pares (nombre, valor).
+        Devuelve (iteraciones completadas como [(profundidad, valor, jugada), ...], nodos)"""
+    key = (player_id, options)
+    ai = _WORKER_PLAYERS.get(key)
+    if ai is None:
+        ai = HexAIPlayer(player_id, budget, **dict(options))
+        _WORKER_PLAYERS[key] = ai
+    board = HexBoard(len(matrix))
+    board.load(matrix)
+    ai.clock.begin(len(moves), budget=budget)
+    ai.search(board, moves)
+    return ai.iterations, ai.nodes
+
+
+class ParallelHexAIPlayer(HexAIPlayer):
+    """ Búsqueda paralela en la raíz: las jugadas de la raíz se reparten entre procesos (el GIL impide
+        usar hilos en esta búsqueda en Python puro) y cada proceso hace su propia profundización iterativa
+        dentro del mismo time_limit. Se elige la mejor jugada de la mayor profundidad que completaron todos.
+        Solo se reparte la búsqueda: el libro de aperturas, las conexiones virtuales y la instrumentación
+        de HexAIPlayer.play siguen igual (los demás argumentos van a HexAIPlayer). Los que cambian la
+        búsqueda (tt_megabytes, max_depth, distance_metric, prune_inferior) se pasan a los procesos;
+        playout_engine no se reparte y da TypeError"""
+    def __init__(self, player_id: int, time_limit, workers=None, tt_megabytes=16, game_time=None, max_depth=None,
+                 distance_metric=None, prune_inferior=False, **kwargs):
+        if kwargs.get("playout_engine") is not None:
+            raise TypeError("ParallelHexAIPlayer no admite playout_engine: cada proceso necesitaría su propio motor")
+        super().__init__(player_id, time_limit, tt_megabytes=tt_megabytes, game_time=game_time, max_depth=max_depth,
+                         distance_metric=distance_metric, prune_inferior=prune_inferior, **kwargs)
+        self.workers = workers or os.cpu_count() or 1
+        # Argumentos de búsqueda de los jugadores de los procesos (también es parte de la clave de su caché)
+        self.worker_options = (("tt_megabytes", tt_megabytes), ("max_depth", max_depth),
+                               ("distance_metric", distance_metric), ("prune_inferior", prune_inferior))
+        self.pool = None    # Se crea en la primera jugada y se reutiliza
+
+    def search(self, board: HexBoard, moves) -> tuple:
+        """Reparte las jugadas de la raíz entre los procesos con el reloj ya iniciado por choose_move"""
+        moves = list(moves)
+        if self.workers == 1 or len(moves) < 2:
+            return super().search(board, moves)
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        # Repartir las jugadas ordenadas de forma intercalada para que cada proceso reciba candidatas buenas
+        ordered = self.order_moves(board, moves, self.player_id, 0, None)
+        groups = [ordered[i::self.workers] for i in range(self.workers)]
+        remaining = self.clock.budget - self.clock.elapsed() - POOL_MARGIN
+        futures = [self.pool.submit(search_subset, self.player_id, board.board, group, remaining,
+                                    self.worker_options)
+                   for group in groups if group]
+        results = [future.result() for future in futures]
+        self.nodes = sum(nodes for _, nodes in results)
+        return self.combine([iterations for iterations, _ in results], ordered)
+
+    def combine(self, results: list, ordered: list) -> tuple:
+        """ Elige la mejor jugada entre los resultados de los procesos a la mayor profundidad común.
+            Deja en self.iterations la iteración elegida, como HexAIPlayer.search"""
+        self.iterations = []
+        self.depth_reached = 0
+        completed = [iterations for iterations in results if iterations]
+        if not completed:
+            return ordered[0]   # Ningún proceso completó la profundidad 1
+        # Una victoria demostrada vale a cualquier profundidad
+        for iterations in completed:
+            depth, score, move = iterations[-1]
+            if score == math.inf:
+                self.depth_reached = depth
+                self.iterations = [iterations[-1]]
+                return move
+        # Un proceso cuyas jugadas pierden todas deja de profundizar antes: no debe bajar la profundidad
+        # común de los demás. Solo si todos perdieron se elige entre ellos
+        alive = [iterations for iterations in completed if iterations[-1][1] != -math.inf]
+        completed = alive or completed
+        common = min(iterations[-1][0] for iterations in completed)
+        best_score, best_move = -math.inf, None
+        for iterations in completed:
+            for depth, score, move in iterations:
+                if depth == common and (best_move is None or score > best_score):
+                    best_score, best_move = score, move
+        self.depth_reached = common
+        self.iterations = [(common, best_score, best_move)]
+        return best_move
+
+    def close(self):
+        """Termina los procesos del pool"""
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
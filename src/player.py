@@ -1,122 +1,456 @@
 from base_class_player import Player
 from base_class_hexboard import HexBoard
+from hex_geometry import neighbor_table, flat_neighbor_table, bridge_table, edge_cells, flatten
+from transposition import TranspositionTable, EXACT, LOWER, UPPER, NO_MOVE
+from zobrist import SIDE_KEY
+from time_manager import TimeManager, SearchTimeout
+from eval_state import EvalState, exact_sum
+from distance import DistanceEngine
+from inferior_cells import InferiorCells
+from vc_solver import VCSolver, UNKNOWN
+from opening_book import OpeningBook, book_path
+from search_stats import SearchStats, timed
+import os
+import time
 import random
 import math
 import heapq
-import time
 
-DIRECTIONS = [(-1, 0), (1, 0), (-1, 1), (1, -1), (0, -1), (0, 1)]
+_REMAINING = {}  # {(size, player_id): [distancia en líneas de cada casilla al borde final]} (heurística de a_star)
 
 class HexAIPlayer(Player):
-    def __init__(self, player_id: int, time_limit):
+    CHECK_INTERVAL = 64         # Cada cuántos nodos se consulta el reloj
+    ASPIRATION_WINDOW = 50      # Semiancho de la ventana alrededor del valor de la iteración anterior
+
+    # Prioridades del ordenamiento de jugadas (de mayor a menor)
+    TT_PRIORITY = 2e9           # Mejor jugada guardada en la tabla de transposición
+    KILLER_PRIORITY = 1e9       # Jugadas que provocaron cortes en la misma profundidad
+    OWN_ADJACENT = 4            # Patrones locales: vecina de una ficha propia,
+    OPPONENT_ADJACENT = 3       # vecina de una ficha rival (bloqueo),
+    OWN_BRIDGE = 5              # forma un puente con una ficha propia (intermedias vacías)
+
+    def __init__(self, player_id: int, time_limit, tt_megabytes=16, game_time=None, max_depth=None,
+                 playout_engine=None, distance_metric=None, prune_inferior=False,
+                 use_vc_solver=False, book_dir=None, instrument=False, stats_log=None, profiler=None):
         super().__init__(player_id) # Llamando al contructor de Player y asignando su player_id
         self.opponent_id = 2 if player_id == 1 else 1   # Id del oponente
         self.time_limit = time_limit
+        self.playout_engine = playout_engine            # BatchPlayoutEngine opcional en lugar de los términos de A*
+        self.distance_metric = distance_metric          # None = A*; "shortest" o "two_distance" usan DistanceEngine
+        self.distance_engines = {}                      # {tamaño: DistanceEngine}
+        self.prune_inferior = prune_inferior            # Descartar casillas muertas/capturadas/vulnerables (inferior_cells)
+        self.inferior = {}                              # {tamaño: InferiorCells}
+        self.use_vc_solver = use_vc_solver              # Conexiones virtuales (vc_solver) antes de buscar
+        self.solvers = {}                               # {tamaño: VCSolver}
+        self.book_dir = book_dir                        # Carpeta de libros de aperturas (hex<N>.book), opcional
+        self.books = {}                                 # {tamaño: OpeningBook o None si no hay archivo}
+        self.book_hit = False   # La última jugada salió del libro de aperturas
+        self.instrument = instrument or stats_log is not None   # SearchStats por jugada en self.stats
+        self.stats_log = stats_log                      # Archivo JSON lines donde se agrega cada SearchStats
+        self.profiler = profiler                        # Hook de perfilado (p. ej. search_stats.CProfileSampler)
+        self.stats = None
+        self.moves_played = 0
+        self.counters = {}      # {método: [llamadas, segundos]} de los métodos medidos
+        if self.instrument:     # Sin instrumentación no se envuelve nada: costo nulo
+            for name in SearchStats.TIMED:
+                counter = self.counters[name] = [0, 0.0]
+                setattr(self, name, timed(getattr(self, name), counter))
+        self.max_depth = max_depth                      # Tope opcional de la profundización iterativa
+        self.clock = TimeManager(time_limit, game_time) # Reparte game_time (si se da) entre las jugadas restantes
+        self.tt = TranspositionTable(tt_megabytes)      # Se conserva entre jugadas; ver self.tt.stats()
+        self.killers = []                               # Dos jugadas asesinas por nivel (ply) de la búsqueda
+        self.history = {1: {}, 2: {}}                   # Tabla de historia: {jugador: {casilla: puntos}}
+        self.nodes = 0
+        self.next_check = self.CHECK_INTERVAL
+        self.pruned = 0         # Jugadas descartadas por inferior_cells en la última búsqueda
+        self.cutoffs = 0        # Cortes beta de la última búsqueda
+        self.timed_out = False  # La última búsqueda abortó una iteración por tiempo
+        self.iteration_nodes = []   # Nodos acumulados al completar cada profundidad
+        self.proven = UNKNOWN   # WIN/LOSS si vc_solver demostró el resultado en la última jugada
+        self.depth_reached = 0  # Profundidad de la última iteración completada en play
+        self.iterations = []    # (profundidad, valor, jugada) de cada iteración completada en play
+        self.eval_state = None  # Términos de evaluate mantenidos incrementalmente sobre el tablero de búsqueda
 
     def play(self, board: HexBoard) -> tuple:
-        #Iniciar el temporizador
-        start_time = time.time()
-        self.start_time = start_time
-
-        # Determinar profundidad dinámica (cuántos niveles de jugadas se van a analizar en minimax)
-        pos_moves = board.get_possible_moves()
-        dynamic_depth = self.get_dynamic_depth(board, len(pos_moves))
-
-        # Usar minimax
-        _, move = self.minimax(board, dynamic_depth, -math.inf, math.inf, True)
-
-        # # Calcular tiempo y retornar
-        # duration = time.time() - start_time
-        # print(f"Tiempo total de jugada: {duration:.3f}s")
+        if not self.instrument and self.profiler is None:
+            return self.choose_move(board)
+        self.moves_played += 1
+        for counter in self.counters.values():
+            counter[0], counter[1] = 0, 0.0
+        self.nodes, self.cutoffs, self.pruned, self.depth_reached = 0, 0, 0, 0
+        self.timed_out, self.iterations, self.iteration_nodes = False, [], []
+        if self.profiler is not None:
+            self.profiler.start_move(self.moves_played)
+        start = time.perf_counter()
+        try:
+            move = self.choose_move(board)
+        finally:
+            if self.profiler is not None:
+                self.profiler.end_move()
+        if self.instrument:
+            self.stats = self.collect_stats(board, move, time.perf_counter() - start)
+            if self.stats_log is not None:
+                with open(self.stats_log, "a", encoding="utf-8") as log:
+                    log.write(self.stats.to_json() + "\n")
         return move
 
-    def get_dynamic_depth(self, board: HexBoard, empty_cells) -> int: # Función para obtener la fase del juego (útil para la profundidad variable)
-        total_cells = board.size * board.size
-        ratio = empty_cells / total_cells
-        if ratio > 0.8:
-            return 3
-        elif ratio > 0.3:
-            return 5
-        else:
-            return 7
-
-    def minimax(self, board, depth, alpha, beta, maximizing_player): # alpha = Mejor valor (MAX) que la IA puede asegurar hasta ahora     
-                                                                     # beta = Mejor valor (MIN) que el oponente puede asegurar
-                                                                     # maximizing_player = Booleano que indica si es o no el turno de la IA
-
-        # Cortamos la evaluación si nos pasamos de tiempo
-        if time.time() - self.start_time > self.time_limit - 0.5:
-            return self.evaluate(board), None
+    def collect_stats(self, board: HexBoard, move, elapsed) -> SearchStats:
+        """Arma el SearchStats de la jugada recién elegida"""
+        stats = SearchStats(self.moves_played, self.player_id, board.size)
+        stats.elapsed = elapsed
+        stats.budget = self.clock.budget
+        stats.source = "book" if self.book_hit else "search" if self.iterations or self.proven == UNKNOWN else "proof"
+        if stats.source == "search":
+            stats.nodes = self.nodes
+            stats.cutoffs = self.cutoffs
+            stats.pruned = self.pruned
+            stats.depth = self.depth_reached
+            stats.timed_out = self.timed_out
+            stats.iteration_nodes = list(self.iteration_nodes)
+            stats.score = self.iterations[-1][1] if self.iterations else None
+        for name, (calls, seconds) in self.counters.items():
+            stats.calls[name] = calls
+            stats.seconds[name] = seconds
+        stats.pv = self.principal_variation(board, move, stats.depth)
+        return stats
+
+    def principal_variation(self, board: HexBoard, move, depth) -> list:
+        """La jugada elegida seguida de las jugadas de la tabla de transposición, hasta `depth` jugadas"""
+        pv = [move]
+        line = board.clone()
+        line.place_piece(*move, self.player_id)
+        player_id = self.opponent_id
+        while len(pv) < depth:
+            key = line.hash if player_id == self.player_id else line.hash ^ SIDE_KEY
+            entry = self.tt.probe(key)
+            if entry is None or entry[3] == NO_MOVE:
+                break
+            row, col = divmod(entry[3], board.size)
+            if not line.place_piece(row, col, player_id):
+                break
+            pv.append((row, col))
+            player_id = 3 - player_id
+        return pv
+
+    def choose_move(self, board: HexBoard) -> tuple:
+        """Libro de aperturas, conexiones virtuales y búsqueda, en ese orden"""
+        self.book_hit = False
+        self.nodes, self.depth_reached = 0, 0   # Sin búsqueda (libro o prueba) quedan en 0
+        if self.book_dir is not None:
+            move = self.book_move(board)
+            if move is not None:
+                self.book_hit = True
+                return move
+        moves = board.get_possible_moves()
+        self.clock.begin(len(moves))
+        move = None
+        if self.use_vc_solver:
+            move, moves = self.prove(board, moves)
+        if move is None:
+            move = self.search(board, moves)
+        self.clock.finish()
+        return move
 
-        # Caso base: Si ya se llegó a la profundidad esperada o el juego terminó, evalúa con heurística y devuelve el valor
+    def book_move(self, board: HexBoard):
+        """Jugada del libro de aperturas para esta posición, o None (el archivo se abre con mmap una sola vez)"""
+        if board.size not in self.books:
+            path = book_path(self.book_dir, board.size)
+            self.books[board.size] = OpeningBook(path) if os.path.exists(path) else None
+        book = self.books[board.size]
+        return book.lookup(board, self.player_id) if book is not None else None
+
+    def prove(self, board: HexBoard, moves) -> tuple:
+        """ Consulta las conexiones virtuales. Devuelve (jugada, None) si el resultado está demostrado,
+            o (None, jugadas a buscar): la región obligada si el rival amenaza conectar, o todas"""
+        solver = self.solvers.get(board.size)
+        if solver is None:
+            solver = self.solvers[board.size] = VCSolver(board.size)
+        self.proven, cells = solver.solve(flatten(board), self.player_id)
+        if self.proven != UNKNOWN and cells:
+            return cells[0], None
+        region = set(cells)
+        return None, [move for move in moves if move in region] or moves
+
+    def search(self, board: HexBoard, moves) -> tuple:
+        """ Profundización iterativa sobre las jugadas de la raíz dadas, hasta que el reloj (ya iniciado) lo permita.
+            Cada profundidad completada se anota en self.iterations como (profundidad, valor, jugada)"""
+        self.nodes = 0
+        self.next_check = self.CHECK_INTERVAL
+        self.killers = []
+        self.iterations = []
+        self.pruned = 0
+        self.cutoffs = 0
+        self.depth_reached = 0
+        self.timed_out = False
+        self.iteration_nodes = []
+        for table in self.history.values():    # La historia de jugadas anteriores pesa la mitad
+            for cell in table:
+                table[cell] //= 2
+
+        # Profundización iterativa sobre una única copia que se modifica en el lugar (jugar/deshacer).
+        # Siempre se conserva la jugada de la última profundidad completada
+        moves = list(moves)
+        search_board = board.clone()
+        if self.prune_inferior:
+            moves = self.fill_in(search_board, moves)
+        self.eval_state = EvalState(search_board, self.player_id)
+        best_move = None
+        score = 0
+        depth_times = [0.0, 0.0]    # Duración de las dos últimas iteraciones
+        max_depth = min(len(search_board.get_possible_moves()), self.max_depth or board.size * board.size)
+        for depth in range(1, max_depth + 1):
+            if depth > 1 and not self.clock.can_start_iteration(depth_times[-1], depth_times[-2]):
+                break   # La siguiente profundidad no terminaría a tiempo: no se empieza
+            iteration_start = self.clock.elapsed()
+            try:
+                score, move, scores = self.aspiration_search(search_board, depth, moves, score)
+            except SearchTimeout:
+                self.timed_out = True
+                break   # Se descarta la iteración incompleta
+            finally:
+                while search_board.history:   # Deshacer lo que haya quedado a medias
+                    self.unmake_move(search_board)
+            best_move = move
+            depth_times.append(self.clock.elapsed() - iteration_start)
+            self.depth_reached = depth
+            self.iterations.append((depth, score, move))
+            self.iteration_nodes.append(self.nodes)
+            if abs(score) == math.inf:
+                break   # Victoria o derrota demostrada: no hace falta buscar más
+            # Ordenar las jugadas de la raíz por el resultado de esta iteración para la siguiente
+            moves.sort(key=lambda m: scores[m], reverse=True)
+
+        if best_move is None:   # Ni la profundidad 1 terminó a tiempo
+            best_move = moves[0]
+        self.eval_state = None
+        return best_move
+
+    def aspiration_search(self, board: HexBoard, depth, moves, previous_score):
+        """Busca con una ventana estrecha alrededor del valor anterior; si el resultado cae fuera, repite con ventana completa"""
+        if depth > 2 and abs(previous_score) != math.inf:
+            alpha = previous_score - self.ASPIRATION_WINDOW
+            beta = previous_score + self.ASPIRATION_WINDOW
+            result = self.search_root(board, depth, moves, alpha, beta)
+            if alpha < result[0] < beta:
+                return result
+        return self.search_root(board, depth, moves, -math.inf, math.inf)
+
+    def search_root(self, board: HexBoard, depth, moves, alpha=-math.inf, beta=math.inf):
+        """Busca cada jugada de la raíz a la profundidad dada. Devuelve (valor, jugada, valor de cada jugada)"""
+        best_score, best_move = -math.inf, None
+        scores = {}
+        for i, move in enumerate(moves):
+            self.make_move(board, move, self.player_id)
+            if i == 0:
+                score, _ = self.minimax(board, depth - 1, alpha, beta, False)
+            else:
+                # Ventana nula: solo se comprueba si la jugada mejora la variante principal
+                score, _ = self.minimax(board, depth - 1, alpha, math.nextafter(alpha, math.inf), False)
+                if alpha < score < beta:
+                    score, _ = self.minimax(board, depth - 1, alpha, beta, False)
+            self.unmake_move(board)
+            scores[move] = score
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break   # Falla alto: aspiration_search repetirá con la ventana completa
+        for move in moves:
+            scores.setdefault(move, -math.inf)
+        if best_move is None:
+            # Todas las jugadas pierden: elegimos la que más complique al rival
+            best_move = self.defensive_fallback_move(board, moves)
+        return best_score, best_move, scores
+
+    def inferior_cells(self, size) -> InferiorCells:
+        analysis = self.inferior.get(size)
+        if analysis is None:
+            analysis = self.inferior[size] = InferiorCells(size)
+        return analysis
+
+    def fill_in(self, board: HexBoard, moves) -> list:
+        """ Rellena en el tablero de búsqueda las casillas muertas y capturadas (no cambian el valor de la
+            posición) y devuelve las jugadas de la raíz que sobreviven. Si el relleno ya decide la partida
+            no se aplica: la búsqueda tiene que encontrar igualmente las respuestas a las intrusiones"""
+        analysis = self.inferior_cells(board.size)
+        grid = flatten(board)
+        analysis.fill_in(grid)
+        original = [row[:] for row in board.board]
+        board.load([grid[row * board.size:(row + 1) * board.size] for row in range(board.size)])
+        if board.check_connection(1) or board.check_connection(2):
+            board.load(original)
+            grid = flatten(board)
+        kept = analysis.candidates(grid, [move for move in moves if board.board[move[0]][move[1]] == 0], self.player_id)
+        if not kept:    # Todas las jugadas dadas quedaron rellenas (p. ej. un subconjunto de ParallelHexAIPlayer)
+            board.load(original)
+            return list(moves)
+        self.pruned += len(moves) - len(kept)
+        return kept
+
+    def check_time(self): # Se llama cada CHECK_INTERVAL nodos, no en cada nodo
+        self.next_check = self.nodes + self.CHECK_INTERVAL
+        if self.clock.expired():
+            raise SearchTimeout()
+
+    def order_moves(self, board: HexBoard, moves, player_id, ply, tt_move):
+        """Ordena las jugadas con información barata: jugada de la tabla, asesinas, historia y patrones locales"""
+        size = board.size
+        grid = board.board
+        opponent_id = 3 - player_id
+        history = self.history[player_id]
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        neighbors = neighbor_table(size)
+        bridges = bridge_table(size)
+
+        def priority(move):
+            if move == tt_move:
+                return self.TT_PRIORITY
+            if move in killers:
+                return self.KILLER_PRIORITY - killers.index(move)
+            row, col = move
+            index = row * size + col
+            score = history.get(index, 0)
+            for nr, nc in neighbors[index]:
+                cell = grid[nr][nc]
+                if cell == player_id:
+                    score += self.OWN_ADJACENT
+                elif cell == opponent_id:
+                    score += self.OPPONENT_ADJACENT
+            for (br, bc), (ar, ac), (cr, cc) in bridges[index]:
+                if grid[br][bc] == player_id and grid[ar][ac] == 0 and grid[cr][cc] == 0:
+                    score += self.OWN_BRIDGE
+            return score
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def record_cutoff(self, board: HexBoard, move, player_id, depth, ply): # Actualiza asesinas e historia tras un corte
+        self.cutoffs += 1
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        index = move[0] * board.size + move[1]
+        history = self.history[player_id]
+        history[index] = history.get(index, 0) + depth * depth
+
+    def minimax(self, board, depth, alpha, beta, maximizing_player, ply=1): # alpha = Mejor valor (MAX) que la IA puede asegurar hasta ahora
+                                                                            # beta = Mejor valor (MIN) que el oponente puede asegurar
+                                                                            # maximizing_player = Booleano que indica si es o no el turno de la IA
+                                                                            # ply = distancia a la raíz (para las jugadas asesinas)
+
+        # Cortamos la búsqueda si nos pasamos de tiempo (la iteración se descarta en play)
+        self.nodes += 1
+        if self.nodes >= self.next_check:
+            self.check_time()
+
+        # Caso base: el juego terminó
         if board.check_connection(self.player_id):
             return math.inf, None
         elif board.check_connection(self.opponent_id):
             return -math.inf, None
-        elif depth == 0 or not board.get_possible_moves():
-            return self.evaluate(board), None
 
-        best_move = None
-        moves = board.get_possible_moves()
+        # Consultar la tabla de transposición (la clave distingue de quién es el turno)
+        key = board.hash if maximizing_player else board.hash ^ SIDE_KEY
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_depth, flag, score, move_index = entry
+            if move_index != NO_MOVE:
+                tt_move = divmod(move_index, board.size)
+            if tt_depth >= depth:   # Solo sirve si se buscó al menos a esta profundidad
+                if flag == EXACT:
+                    return score, tt_move
+                elif flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score, tt_move
 
-        # Ordenar movimientos antes de evaluarlos (se ordenan según la heurística utilizada)
-        if maximizing_player: # Si estamos maximizando al jugador, ordenar jugadas por valores de mayor a menor según la heurística
-            moves.sort(key=lambda move: self.evaluate_after_move(board, move, self.player_id), reverse=True)
-        else:   # Si estamos minimizando, ordenar jugadas por valores de menor a mayor segun la heurística
-            moves.sort(key=lambda move: self.evaluate_after_move(board, move, self.opponent_id), reverse=False)
-
-        # Evaluando jugada: Caso turno de IA
-        if maximizing_player: # Caso: Turno de la IA (escoger mejor jugada)
-            max_eval = -math.inf
-            for move in moves: # Ciclo de evaluación de jugadas disponibles
-                new_board = board.clone()
-                new_board.place_piece(*move, self.player_id)
-                eval, _ = self.minimax(new_board, depth - 1, alpha, beta, False) # Se evalúa cuán bueno es el 'futuro' tras esa jugada
-                if eval > max_eval: # Procedemos a quedarnos con la mejor evaluación entre la que teníamos y esta
-                    max_eval = eval
-                    best_move = move
+        # Caso base: Si ya se llegó a la profundidad esperada, evalúa con heurística y devuelve el valor
+        moves = board.get_possible_moves()
+        if depth == 0 or not moves:
+            score = self.evaluate(board, self.player_id if maximizing_player else self.opponent_id)
+            if self.playout_engine is None:     # Un valor de simulaciones es aleatorio: no se guarda como exacto
+                self.tt.store(key, 0, EXACT, score)
+            return score, None
+
+        player_id = self.player_id if maximizing_player else self.opponent_id
+        if self.prune_inferior and depth >= 2:  # En las hojas el análisis costaría más de lo que ahorra
+            count = len(moves)
+            moves = self.inferior_cells(board.size).candidates(flatten(board), moves, player_id)
+            self.pruned += count - len(moves)
+        moves = self.order_moves(board, moves, player_id, ply, tt_move)
+        best_move = None
+        best_eval = -math.inf if maximizing_player else math.inf
+
+        # Búsqueda de variante principal: la primera jugada con ventana completa, el resto con ventana nula
+        for i, move in enumerate(moves):
+            self.make_move(board, move, player_id)
+            if i == 0:
+                eval, _ = self.minimax(board, depth - 1, alpha, beta, not maximizing_player, ply + 1)
+            elif maximizing_player:
+                eval, _ = self.minimax(board, depth - 1, alpha, math.nextafter(alpha, math.inf), False, ply + 1)
+                if alpha < eval < beta:     # Mejora la variante principal: repetir con la ventana completa
+                    eval, _ = self.minimax(board, depth - 1, alpha, beta, False, ply + 1)
+            else:
+                eval, _ = self.minimax(board, depth - 1, math.nextafter(beta, -math.inf), beta, True, ply + 1)
+                if alpha < eval < beta:
+                    eval, _ = self.minimax(board, depth - 1, alpha, beta, True, ply + 1)
+            self.unmake_move(board)
+
+            if maximizing_player: # Caso: Turno de la IA (escoger mejor jugada)
+                if eval > best_eval:
+                    best_eval, best_move = eval, move
                 alpha = max(alpha, eval)
-                if beta <= alpha: # Si mi jugada actual no supera a la peor jugada del rival, no tiene sentido seguir explorando esa rama 
-                    break
-            if best_move is None and moves:
-                # Si no se eligió jugada por poda u otra razón, elegimos una jugada para molestar al rival
-                fallback_move = self.defensive_fallback_move(board, moves)
-                return max_eval, fallback_move
-            return max_eval, best_move
-        # Evaluando jugada: Caso turno de oponente
-        else:
-            min_eval = math.inf
-            for move in moves:
-                new_board = board.clone()
-                new_board.place_piece(*move, self.opponent_id)
-                eval, _ = self.minimax(new_board, depth - 1, alpha, beta, True)
-                if eval < min_eval:
-                    min_eval = eval
-                    best_move = move
+            else:                 # Caso: turno de oponente
+                if eval < best_eval:
+                    best_eval, best_move = eval, move
                 beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            if best_move is None and moves:
-                # Si no se eligió jugada por poda u otra razón, elegimos una jugada para molestar al rival
-                fallback_move = self.defensive_fallback_move(board, moves)
-                return min_eval, fallback_move
-            return min_eval, best_move
+            if beta <= alpha: # Si la jugada actual ya es peor que lo que el rival puede asegurar, no seguir explorando
+                self.record_cutoff(board, move, player_id, depth, ply)
+                break
+
+        if best_move is None:
+            # Si no se eligió jugada por poda u otra razón, elegimos una jugada para molestar al rival
+            best_move = self.defensive_fallback_move(board, moves)
+        self.store_result(key, board, depth, best_eval, alpha_orig, beta_orig, best_move)
+        return best_eval, best_move
+
+    def store_result(self, key, board, depth, score, alpha, beta, move): # Guarda un nodo en la tabla de transposición
+        if score <= alpha:
+            flag = UPPER    # Ninguna jugada superó alpha: el valor real puede ser menor
+        elif score >= beta:
+            flag = LOWER    # Hubo corte: el valor real puede ser mayor
+        else:
+            flag = EXACT
+        move_index = move[0] * board.size + move[1] if move is not None else NO_MOVE
+        self.tt.store(key, depth, flag, score, move_index)
 
     def evaluate_after_move(self, board: HexBoard, move, player_id): # Evalúa rápidamente un tablero como si el jugador hiciera esa jugada
-        temp_board = board.clone()
-        temp_board.place_piece(*move, player_id)
-        return self.evaluate(temp_board)
+        self.make_move(board, move, player_id)
+        score = self.evaluate(board, 3 - player_id)
+        self.unmake_move(board)    # Dejar el tablero como estaba
+        return score
+
+    def make_move(self, board: HexBoard, move, player_id): # Coloca una ficha en el tablero de búsqueda y actualiza la evaluación incremental
+        board.place_piece(*move, player_id)
+        if self.eval_state is not None and self.eval_state.board is board:
+            self.eval_state.place(move[0], move[1], player_id)
+
+    def unmake_move(self, board: HexBoard): # Deshace la última jugada de make_move
+        row, col = board.history[-1][:2]
+        player_id = board.board[row][col]
+        board.undo()
+        if self.eval_state is not None and self.eval_state.board is board:
+            self.eval_state.remove(row, col, player_id)
 
     def neighbors(self, row, col, board):
-        dirs = DIRECTIONS
-        # Obteniendo vecinos
-        neighbors = []
-        size = board.size
-        for dr, dc in dirs:
-            nr, nc = row + dr, col + dc
-            if 0 <= nr < size and 0 <= nc < size:
-                neighbors.append((nr, nc))
-        return neighbors
+        # Vecinos precalculados por tamaño (hex_geometry); la lista es compartida y no se debe modificar
+        return neighbor_table(board.size)[row * board.size + col]
 
     def defensive_fallback_move(self, board, moves):
         # Evalúa qué jugada complica más al oponente (minimiza su evaluación)
@@ -135,7 +469,46 @@ class HexAIPlayer(Player):
 
         return best_defensive_move
         
-    def evaluate(self, board: HexBoard) -> float:
+    def evaluate(self, board: HexBoard, to_move=None) -> float:
+        """ to_move: jugador al que le toca (solo lo usa playout_engine). Si no se da, se deduce de la
+            cantidad de fichas, lo que no vale en la búsqueda con prune_inferior (el relleno no cambia el turno)"""
+        state = self.eval_state
+        if state is not None and state.board is board:
+            return self.incremental_evaluate(state, to_move)
+        return self.full_evaluate(board, to_move)
+
+    def incremental_evaluate(self, state: EvalState, to_move=None) -> float:
+        """ Mismo valor que full_evaluate, bit a bit, a partir de los términos mantenidos en EvalState
+            (solo A* se recalcula). Se suma en el mismo orden; los términos de casillas vacías y de cadenas
+            se agrupan en una sola suma cuando ninguna suma parcial redondea (exact_sum), si no se repiten uno a uno"""
+        score = state.material
+        score = self.add_path_terms(state.board, score, state.empty_count, to_move)
+
+        # Centralidad y vecinos de las casillas vacías
+        if exact_sum(score, state.centrality_sum * 0.5 + (state.friendly + state.enemy) * 1.5):
+            score += state.centrality_sum * 0.5 + state.friendly * 1.5 - state.enemy * 1.5
+        else:
+            for centrality, friendly, enemy in state.empty_terms():
+                score += centrality
+                score += friendly
+                score -= enemy
+
+        # Bloqueos, fila por fila
+        for bonus in state.blocking_bonuses():
+            score += bonus
+
+        # Cadenas: 50 por ficha propia y -50 por ficha rival, cadena por cadena en el orden de find_chains
+        stones = state.size * state.size - state.empty_count
+        if exact_sum(score, 50 * stones):
+            score += 5 * state.material
+        else:
+            for chain_length in state.chain_sizes(self.player_id):
+                score += 50 * chain_length
+            for chain_length in state.chain_sizes(self.opponent_id):
+                score -= 50 * chain_length
+        return score
+
+    def full_evaluate(self, board: HexBoard, to_move=None) -> float:
         size = board.size
         score = 0
         empty_cells = []
@@ -151,15 +524,7 @@ class HexAIPlayer(Player):
                 else:
                     empty_cells.append((row, col))  # Guarda las casillas vacías para análisis posterior
 
-        # A* heurístico
-        my_path_cost = self.a_star(board, self.player_id)
-        opp_path_cost = self.a_star(board, self.opponent_id)
-        if opp_path_cost <= 3:
-            score -= 300  # Penalización fuerte si el oponente casi conecta
-        if my_path_cost != math.inf:
-            score += 1000 / (1 + my_path_cost)  # Mientras más costoso sea el camino, menor es la puntuación
-        if opp_path_cost != math.inf:
-            score -= 1000 / (1 + opp_path_cost) # Lo mismo para el análisis del jugador contrario
+        score = self.add_path_terms(board, score, len(empty_cells), to_move)
 
         # Centralidad y vecinos
         mid = size // 2
@@ -216,82 +581,115 @@ class HexAIPlayer(Player):
         # Penaliza las cadenas largas del oponente
         for chain in chains_opponent:
             chain_length = len(chain)
-            score -= 50 * chain_length        
+            score -= 50 * chain_length
+
+        return score
 
+    def add_path_terms(self, board: HexBoard, score, empty_count, to_move=None): # Suma a score los términos de camino mínimo (A* o simulaciones)
+        if self.playout_engine is not None:
+            # Alternativa al A*: probabilidad de ganar estimada con simulaciones vectorizadas
+            if to_move is None:
+                stones = board.size * board.size - empty_count
+                to_move = 1 if stones % 2 == 0 else 2   # Las partidas alternan empezando por el jugador 1
+            score += self.playout_engine.path_score(board, self.player_id, to_move)
+        else:
+            if self.distance_metric is None:
+                # A* heurístico
+                my_path_cost = self.a_star(board, self.player_id)
+                opp_path_cost = self.a_star(board, self.opponent_id)
+            else:
+                # Distancias de ambos jugadores en una sola llamada (costo exacto o dos distancias)
+                my_path_cost, opp_path_cost = self.path_costs(board)
+            if opp_path_cost <= 3:
+                score -= 300  # Penalización fuerte si el oponente casi conecta
+            if my_path_cost != math.inf:
+                score += 1000 / (1 + my_path_cost)  # Mientras más costoso sea el camino, menor es la puntuación
+            if opp_path_cost != math.inf:
+                score -= 1000 / (1 + opp_path_cost) # Lo mismo para el análisis del jugador contrario
         return score
 
+    def path_costs(self, board: HexBoard) -> tuple: # (costo propio, costo rival) según distance_metric
+        engine = self.distance_engines.get(board.size)
+        if engine is None:
+            engine = self.distance_engines[board.size] = DistanceEngine(board.size)
+        grid = flatten(board)
+        if self.distance_metric == "two_distance":
+            costs = engine.two_distances(grid)
+        else:
+            costs = engine.shortest_costs(grid)
+        return costs[self.player_id - 1], costs[self.opponent_id - 1]
+
     def a_star(self, board: HexBoard, player_id):  # Devuelve el costo mínimo de unir dos lados
         size = board.size
-        visited = set()
+        grid = flatten(board)                       # Casillas como índices planos fila*size+col
+        neighbors = flat_neighbor_table(size)
+        visited = bytearray(size * size)
+        cost_so_far = [math.inf] * (size * size)    # Para evitar caminos peores y no volver a insertar caminos más costosos de forma innecesaria
         heap = []
-        cost_so_far = {}    # Para evitar caminos peores y no volver a insertar caminos más costosos de forma innecesaria
-
-        def heuristic(row, col): # Heurística: distancia Manhattan al borde opuesto
-            return size - 1 - (col if player_id == 1 else row)
 
-        def is_goal(row, col): # Verifica si llegamos al lado opuesto
-            return (col == size - 1) if player_id == 1 else (row == size - 1)
+        # Heurística: distancia Manhattan al borde opuesto (0 = llegamos al lado opuesto)
+        heuristic = _REMAINING.get((size, player_id))
+        if heuristic is None:
+            heuristic = [size - 1 - (i % size if player_id == 1 else i // size) for i in range(size * size)]
+            _REMAINING[(size, player_id)] = heuristic
 
         # Inicialmente se guardan las casillas que tocan uno de los lados en el espacio de búsqueda
-        for i in range(size):
-            row, col = (i, 0) if player_id == 1 else (0, i)
-            cell = board.board[row][col]
+        for index in edge_cells(size, player_id)[0]:
+            cell = grid[index]
             if cell == player_id:
                 cost = 0    # Costo cero para casillas propias
             elif cell == 0:
                 cost = 1    # Costo uno para casillas vacías
             else:
                 continue  # Casilla del oponente, no válida para iniciar
-            heapq.heappush(heap, (cost + heuristic(row, col), cost, row, col))  # Se mete el costo+heuristic primero pq por ese término es q se ordena el heap
-            cost_so_far[(row, col)] = cost
+            heapq.heappush(heap, (cost + heuristic[index], cost, index))  # Se mete el costo+heuristic primero pq por ese término es q se ordena el heap
+            cost_so_far[index] = cost
 
-        # Analizando espacio de búsqueda
+        # Analizando espacio de búsqueda (el índice plano desempata igual que (fila, columna))
         while heap:
-            priority, cost, row, col = heapq.heappop(heap)  # Priority no la usamos más, solo es el término q se usa para ordenar
-            if (row, col) in visited:
+            priority, cost, index = heapq.heappop(heap)  # Priority no la usamos más, solo es el término q se usa para ordenar
+            if visited[index]:
                 continue
-            visited.add((row, col))
+            visited[index] = 1
 
-            if is_goal(row, col):
+            if heuristic[index] == 0:
                 return cost
 
-            for nr, nc in self.neighbors(row, col, board):
-                if (nr, nc) in visited:
+            for neighbor in neighbors[index]:
+                if visited[neighbor]:
                     continue
-                cell = board.board[nr][nc]
+                cell = grid[neighbor]
                 if cell == player_id:
                     new_cost = cost  # Paso gratis
                 elif cell == 0:
                     new_cost = cost + 1  # Paso leve
                 else:
                     new_cost = cost + 5  # Penalización fuerte
-                if (nr, nc) not in cost_so_far or new_cost < cost_so_far[(nr, nc)]:
-                    cost_so_far[(nr, nc)] = new_cost
-                    heapq.heappush(heap, (new_cost + heuristic(nr, nc), new_cost, nr, nc))
+                if new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    heapq.heappush(heap, (new_cost + heuristic[neighbor], new_cost, neighbor))
 
         return math.inf  # No hay camino posible
 
     def find_chains(self, board: HexBoard, player_id: int):
-        # Encuentra todas las cadenas conectadas del jugador
+        # Encuentra todas las cadenas conectadas del jugador (DFS con pila explícita, sin límite de recursión)
         size = board.size
         visited = set()
         chains = []
 
-        def dfs(row, col, chain):
-            if (row, col) in visited or not (0 <= row < size and 0 <= col < size):
-                return
-            if board.board[row][col] == player_id:
-                visited.add((row, col))
-                chain.append((row, col))
-                for nr, nc in self.neighbors(row, col, board):
-                    dfs(nr, nc, chain)
-
         for row in range(size):
             for col in range(size):
                 if (row, col) not in visited and board.board[row][col] == player_id:
                     chain = []
-                    dfs(row, col, chain)
-                    if chain:
-                        chains.append(chain)
-
-        return chains
\ No newline at end of file
+                    stack = [(row, col)]
+                    visited.add((row, col))
+                    while stack:
+                        r, c = stack.pop()
+                        chain.append((r, c))
+                        for nr, nc in self.neighbors(r, c, board):
+                            if (nr, nc) not in visited and board.board[nr][nc] == player_id:
+                                visited.add((nr, nc))
+                                stack.append((nr, nc))
+                    chains.append(chain)
+
+        return chains
@@ -0,0 +1,133 @@
+import math
+import threading
+import time
+
+from base_class_hexboard import HexBoard
+from eval_state import EvalState
+from player import HexAIPlayer
+from time_manager import SearchTimeout
+from transposition import NO_MOVE
+from zobrist import SIDE_KEY
+
+
+class PonderingHexAIPlayer(HexAIPlayer):
+    """ HexAIPlayer que sigue buscando mientras piensa el rival (pondering).
+        Después de devolver su jugada lanza un hilo que busca en la tabla de transposición compartida:
+          - mode="predicted": la posición tras la respuesta esperada (la jugada de la tabla para el rival)
+          - mode="all": la posición tras la jugada propia con el rival por mover (todas sus respuestas)
+        Cuando llega la jugada real, play() detiene el hilo y la búsqueda normal aprovecha la tabla.
+        El hilo consulta la señal de parada cada PONDER_CHECK_INTERVAL nodos, así que se detiene en pocos
+        milisegundos. Por el GIL conviene contra un humano o un rival en otro proceso: un rival en el
+        mismo proceso compartiría la CPU con el hilo"""
+    PONDER_CHECK_INTERVAL = 8
+
+    def __init__(self, player_id: int, time_limit, mode="all", **kwargs):
+        super().__init__(player_id, time_limit, **kwargs)
+        self.mode = mode
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.pondering = False
+        self.ponder_matrix = None   # Posición que se está pensando
+        self.ponder_reply = False   # La posición pensada ya incluye la respuesta esperada del rival
+        self.saved_history = None   # Tabla de historia antes del pondering (se restaura si no acierta)
+        self.ponder_hit = False     # La jugada real del rival coincidió con lo pensado
+        self.ponder_depth = 0       # Profundidad completada por el último pondering
+        self.ponder_nodes = 0       # Nodos del último pondering
+        self.move_nodes = 0         # Nodos y profundidad de la última jugada, fijados antes de lanzar el hilo
+        self.move_depth = 0         # (el hilo sigue sumando a self.nodes mientras piensa)
+        self.stop_latency = 0.0     # Segundos entre la orden de parar y el final del hilo
+
+    def play(self, board: HexBoard) -> tuple:
+        self.stop_pondering()
+        self.ponder_hit = self.matches_ponder(board)
+        if not self.ponder_hit and self.saved_history is not None:
+            self.history = self.saved_history   # La historia de una posición que no se dio solo estorba
+        self.saved_history = None
+        move = super().play(board)
+        self.move_nodes, self.move_depth = self.nodes, self.depth_reached
+        self.start_pondering(board, move)
+        return move
+
+    def matches_ponder(self, board: HexBoard) -> bool:
+        """¿board es la posición pensada (con la respuesta esperada) o la pensada más una ficha del rival?"""
+        if self.ponder_matrix is None:
+            return False
+        added = []
+        for row, line in enumerate(board.board):
+            for col, cell in enumerate(line):
+                if cell != self.ponder_matrix[row][col]:
+                    added.append((row, col, self.ponder_matrix[row][col], cell))
+        if self.ponder_reply:
+            return not added
+        return len(added) == 1 and added[0][2:] == (0, self.opponent_id)
+
+    def start_pondering(self, board: HexBoard, move: tuple):
+        """Lanza el hilo de pondering sobre una copia de board con la jugada propia ya hecha"""
+        self.ponder_matrix = None
+        ponder_board = board.clone()
+        ponder_board.place_piece(*move, self.player_id)
+        if ponder_board.check_connection(self.player_id) or not ponder_board.get_possible_moves():
+            return
+        maximizing = False  # El rival mueve: se piensan todas sus respuestas
+        if self.mode == "predicted":
+            entry = self.tt.probe(ponder_board.hash ^ SIDE_KEY)
+            if entry is not None and entry[3] != NO_MOVE:
+                reply = divmod(entry[3], board.size)
+                if ponder_board.board[reply[0]][reply[1]] == 0:
+                    ponder_board.place_piece(*reply, self.opponent_id)
+                    maximizing = True
+        if ponder_board.check_connection(self.opponent_id):
+            return
+        ponder_board = ponder_board.clone()     # Historia vacía: el hilo deshace solo lo que él juega
+        self.ponder_matrix = [line[:] for line in ponder_board.board]
+        self.ponder_reply = maximizing
+        self.saved_history = {player_id: dict(table) for player_id, table in self.history.items()}
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.ponder, args=(ponder_board, maximizing), daemon=True)
+        self.thread.start()
+
+    def ponder(self, board: HexBoard, maximizing: bool):
+        """Profundización iterativa sin límite de tiempo hasta que stop_pondering lo pida"""
+        self.pondering = True
+        self.ponder_depth = 0
+        searched = self.nodes       # Los nodos de la última búsqueda se restauran al terminar
+        self.next_check = self.nodes + self.PONDER_CHECK_INTERVAL
+        # Sin clock.begin: check_time solo mira stop_event y el reloj conserva los datos de la jugada
+        self.eval_state = EvalState(board, self.player_id)
+        try:
+            for depth in range(1, min(len(board.get_possible_moves()), self.max_depth or math.inf) + 1):
+                score, _ = self.minimax(board, depth, -math.inf, math.inf, maximizing)
+                self.ponder_depth = depth
+                if abs(score) == math.inf:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            while board.history:
+                self.unmake_move(board)
+            self.eval_state = None
+            self.ponder_nodes = self.nodes - searched
+            self.nodes = searched
+            self.pondering = False
+
+    def stop_pondering(self):
+        """Detiene el hilo de pondering (si lo hay) y espera a que termine"""
+        if self.thread is None:
+            return
+        start = time.perf_counter()
+        self.stop_event.set()
+        self.thread.join()
+        self.stop_latency = time.perf_counter() - start
+        self.thread = None
+
+    def check_time(self):
+        if self.pondering:
+            self.next_check = self.nodes + self.PONDER_CHECK_INTERVAL
+            if self.stop_event.is_set():
+                raise SearchTimeout()
+        else:
+            super().check_time()
+
+    def close(self):
+        """Detiene el pondering al terminar la partida"""
+        self.stop_pondering()
@@ -0,0 +1,114 @@
+import cProfile
+import json
+import math
+import pstats
+import time
+
+
+class SearchStats:
+    """ Estadísticas de una llamada a HexAIPlayer.play (solo con instrument=True).
+        Los tiempos de TIMED son inclusivos: evaluate incluye los a_star y find_chains que hace"""
+    TIMED = ("evaluate", "a_star", "find_chains")
+
+    def __init__(self, move_number: int, player_id: int, size: int):
+        self.move_number = move_number
+        self.player_id = player_id
+        self.size = size
+        self.timestamp = time.time()
+        self.elapsed = 0.0
+        self.budget = 0.0
+        self.source = "search"      # "search", "book" (libro de aperturas) o "proof" (vc_solver)
+        self.nodes = 0
+        self.cutoffs = 0
+        self.pruned = 0
+        self.depth = 0
+        self.timed_out = False      # Se abortó una iteración por tiempo
+        self.iteration_nodes = []   # Nodos acumulados al terminar cada profundidad
+        self.calls = {name: 0 for name in self.TIMED}
+        self.seconds = {name: 0.0 for name in self.TIMED}
+        self.pv = []                # Variante principal desde la posición (jugada elegida primero)
+        self.score = None
+
+    def effective_branching_factor(self):
+        """Nodos de la última profundidad completada entre los de la anterior"""
+        counts = self.iteration_nodes
+        if len(counts) < 2:
+            return None
+        last = counts[-1] - counts[-2]
+        previous = counts[-2] - (counts[-3] if len(counts) > 2 else 0)
+        return last / previous if previous else None
+
+    def to_dict(self) -> dict:
+        return {
+            "move": self.move_number,
+            "player": self.player_id,
+            "size": self.size,
+            "timestamp": self.timestamp,
+            "elapsed": self.elapsed,
+            "budget": self.budget,
+            "source": self.source,
+            "nodes": self.nodes,
+            "nps": self.nodes / self.elapsed if self.elapsed > 0 else 0.0,
+            "cutoffs": self.cutoffs,
+            "pruned": self.pruned,
+            "depth": self.depth,
+            "timed_out": self.timed_out,
+            "ebf": self.effective_branching_factor(),
+            "iteration_nodes": self.iteration_nodes,
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "score": self.score if self.score is None or math.isfinite(self.score) else str(self.score),
+            "pv": [list(move) for move in self.pv],
+        }
+
+    def to_json(self) -> str:
+        """Una línea JSON (para logs estructurados en formato JSON lines)"""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+def timed(function, counter: list):
+    """Envuelve un método para contar llamadas y tiempo acumulado en counter = [llamadas, segundos]"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += time.perf_counter() - start
+    return wrapper
+
+
+class CProfileSampler:
+    """ Hook de perfilado para HexAIPlayer(profiler=...): perfila con cProfile una de cada `every`
+        jugadas y acumula los resultados. Cualquier objeto con start_move(número) y end_move() sirve
+        como hook (por ejemplo, uno que marque los intervalos para `perf record`)"""
+    def __init__(self, every: int = 10):
+        self.every = every
+        self.profile = None
+        self.stats = None       # pstats.Stats acumulado
+        self.sampled = 0
+
+    def start_move(self, move_number: int):
+        if move_number % self.every == 0:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def end_move(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        if self.stats is None:
+            self.stats = pstats.Stats(self.profile)
+        else:
+            self.stats.add(self.profile)
+        self.profile = None
+        self.sampled += 1
+
+    def dump(self, path: str):
+        """Guarda el perfil acumulado (se abre con pstats o snakeviz)"""
+        if self.stats is not None:
+            self.stats.dump_stats(path)
+
+    def print_stats(self, limit: int = 20, sort: str = "cumulative"):
+        if self.stats is not None:
+            self.stats.sort_stats(sort).print_stats(limit)
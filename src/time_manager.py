@@ -0,0 +1,59 @@
+import time
+
+GAME_FILL = 0.5         # Fracción de las casillas vacías que se espera ocupar antes de que alguien conecte
+MIN_EXPECTED_MOVES = 2  # Nunca gastar todo el tiempo restante en una sola jugada
+MIN_GROWTH = 2.0        # Límites para estimar cuánto tardará la siguiente iteración
+MAX_GROWTH = 30.0
+DEFAULT_GROWTH = 6.0
+
+
+class SearchTimeout(Exception):
+    """Se lanza dentro de la búsqueda cuando se acaba el tiempo asignado a la jugada"""
+
+
+class TimeManager:
+    """ Reparte el presupuesto de tiempo entre las jugadas que se espera que queden.
+        move_limit: tope de segundos por jugada (el time_limit del jugador)
+        game_time: presupuesto total de la partida (None = solo se usa el tope por jugada)"""
+    def __init__(self, move_limit: float, game_time: float = None):
+        self.move_limit = move_limit
+        self.game_time = game_time
+        self.used = 0.0         # Segundos gastados en la partida
+        self.start = 0.0
+        self.deadline = 0.0
+        self.budget = 0.0
+
+    def expected_moves(self, empty_cells: int) -> int:
+        """Estimación de las jugadas propias que quedan en la partida"""
+        return max(MIN_EXPECTED_MOVES, int(empty_cells * GAME_FILL / 2))
+
+    def begin(self, empty_cells: int, budget: float = None) -> float:
+        """Inicia el reloj de una jugada y devuelve los segundos asignados (budget fuerza un valor concreto)"""
+        self.start = time.perf_counter()
+        if budget is None:
+            budget = self.move_limit - min(0.5, self.move_limit * 0.1)   # Margen para devolver la jugada a tiempo
+            if self.game_time is not None:
+                remaining = self.game_time - self.used
+                budget = min(budget, remaining / self.expected_moves(empty_cells))
+        self.budget = max(budget, 0.01)
+        self.deadline = self.start + self.budget
+        return self.budget
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.deadline
+
+    def can_start_iteration(self, last: float, previous: float) -> bool:
+        """Decide si la siguiente profundidad puede terminar a tiempo, a partir de lo que
+           tardaron las dos últimas iteraciones (last y previous, en segundos)"""
+        if previous > 0:
+            growth = min(MAX_GROWTH, max(MIN_GROWTH, last / previous))
+        else:
+            growth = DEFAULT_GROWTH
+        return self.elapsed() + last * growth <= self.budget
+
+    def finish(self):
+        """Registra el tiempo gastado en la jugada"""
+        self.used += self.elapsed()
@@ -0,0 +1,254 @@
+""" Torneos sin interfaz entre dos jugadores, repartidos en un pool de procesos.
+
+Uso:
+    python src/tournament.py --a player:HexAIPlayer --a-args '{"time_limit": 1}' \\
+        --b mcts_player:MCTSPlayer --b-args '{"time_limit": 1}' --games 20 --sizes 5 7 \\
+        --workers 4 --json resultados.json --csv jugadas.csv --records registros
+
+Cada jugador se da como "módulo:Clase" más los argumentos del constructor (sin player_id).
+Las partidas van en pares con la misma apertura aleatoria y los colores cambiados.
+El resumen incluye tasa de victorias, diferencia de Elo con intervalo del 95 %, SPRT y latencia
+y nodos por jugada. El JSON guarda el resumen y todas las partidas; el CSV, una fila por jugada.
+Con --records cada proceso agrega sus partidas a un archivo .hexg (ver game_records.py).
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import importlib
+import json
+import math
+import os
+import random
+import time
+
+from base_class_hexboard import HexBoard
+from game_records import GameRecorder, EXTENSION
+
+SPRT_ALPHA = 0.05
+SPRT_BETA = 0.05
+
+
+def load_class(path: str):
+    """Importa "módulo:Clase" (los módulos se buscan junto a este archivo)"""
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def move_stats(player) -> tuple:
+    """ (nodos, profundidad) de la última jugada, para los jugadores que los exponen.
+        (None, None) si la jugada no salió de una búsqueda (libro de aperturas o conexiones virtuales).
+        move_nodes/move_depth (PonderingHexAIPlayer) tienen prioridad: nodes sigue creciendo con el pondering"""
+    nodes = getattr(player, "move_nodes", None)
+    if nodes is None:
+        nodes = getattr(player, "nodes", None)
+    if nodes is None:
+        nodes = getattr(player, "playouts", None)     # MCTSPlayer
+    if nodes == 0:
+        return None, None
+    return nodes, getattr(player, "move_depth", getattr(player, "depth_reached", None))
+
+
+def play_game(game: int, size: int, first: dict, second: dict, opening_plies: int, seed: int,
+              records=None) -> dict:
+    """ Se ejecuta en un proceso del pool: una partida entre dos jugadores descritos como
+        {"name", "class", "args"}; first juega como jugador 1. Una jugada ilegal pierde la partida.
+        Si se da la carpeta records, la partida se agrega al archivo de registros de este proceso"""
+    random.seed(seed)
+    recorder = None
+    if records is not None:
+        recorder = GameRecorder(os.path.join(records, f"tournament-{os.getpid()}{EXTENSION}"))
+        recorder.start(size)
+    players = {}
+    for player_id, spec in ((1, first), (2, second)):
+        players[player_id] = load_class(spec["class"])(player_id, **spec["args"])
+    board = HexBoard(size)
+    rng = random.Random(seed)
+    moves = []
+    winner = None
+    current = 1
+    for _ in range(opening_plies):      # Apertura aleatoria, compartida por las dos partidas del par
+        row, col = rng.choice(board.get_possible_moves())
+        board.place_piece(row, col, current)
+        if recorder:
+            recorder.move(row, col)
+        moves.append({"player": current, "row": row, "col": col, "latency": 0.0, "nodes": None,
+                      "depth": None, "opening": True})
+        current = 3 - current
+        if board.check_connection(3 - current):
+            winner = 3 - current
+            break
+
+    while winner is None:
+        player = players[current]
+        start = time.perf_counter()
+        row, col = player.play(board)
+        latency = time.perf_counter() - start
+        nodes, depth = move_stats(player)
+        moves.append({"player": current, "row": row, "col": col, "latency": latency, "nodes": nodes,
+                      "depth": depth, "opening": False})
+        if not board.place_piece(row, col, current):
+            winner = 3 - current    # Jugada ilegal
+        else:
+            if recorder:
+                recorder.move(row, col)
+            if board.check_connection(current):
+                winner = current
+        current = 3 - current
+
+    if recorder:
+        recorder.end(winner)
+        recorder.close()
+
+    for player in players.values():
+        if hasattr(player, "close"):
+            player.close()
+    names = {1: first["name"], 2: second["name"]}
+    for move in moves:
+        move["engine"] = names[move["player"]]
+    return {"game": game, "size": size, "seed": seed, "player1": names[1], "player2": names[2],
+            "winner": names[winner], "moves": moves}
+
+
+def elo(score: float) -> float:
+    """Diferencia de Elo equivalente a una fracción de puntos"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def sprt(wins: int, losses: int, elo0: float, elo1: float) -> dict:
+    """ Test secuencial de razón de probabilidades (Bernoulli: en Hex no hay empates)
+        entre H0: diferencia = elo0 y H1: diferencia = elo1"""
+    p0 = 1 / (1 + 10 ** (-elo0 / 400))
+    p1 = 1 / (1 + 10 ** (-elo1 / 400))
+    llr = wins * math.log(p1 / p0) + losses * math.log((1 - p1) / (1 - p0))
+    lower = math.log(SPRT_BETA / (1 - SPRT_ALPHA))
+    upper = math.log((1 - SPRT_BETA) / SPRT_ALPHA)
+    result = "H1" if llr >= upper else "H0" if llr <= lower else "continuar"
+    return {"elo0": elo0, "elo1": elo1, "llr": llr, "lower": lower, "upper": upper, "result": result}
+
+
+def summarize(games: list, a: str, b: str, elo0: float = 0.0, elo1: float = 30.0) -> dict:
+    """Resumen del punto de vista de a: victorias, Elo (intervalo 95 %), SPRT y estadísticas por motor"""
+    wins = sum(game["winner"] == a for game in games)
+    total = len(games)
+    losses = total - wins
+    score = wins / total if total else 0.5
+    error = math.sqrt(score * (1 - score) / total) if total else 0.0
+    engines = {}
+    for name in (a, b):
+        played = [move for game in games for move in game["moves"]
+                  if move["engine"] == name and not move["opening"]]
+        latencies = sorted(move["latency"] for move in played)
+        nodes = [move["nodes"] for move in played if move["nodes"] is not None]
+        engines[name] = {
+            "wins": sum(game["winner"] == name for game in games),
+            "moves": len(played),
+            "latency_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "latency_max": latencies[-1] if latencies else 0.0,
+            "nodes_mean": sum(nodes) / len(nodes) if nodes else None,
+        }
+    return {
+        "games": total,
+        "a": a,
+        "b": b,
+        "win_rate": score,
+        "elo": elo(score),
+        "elo_low": elo(score - 1.96 * error),
+        "elo_high": elo(score + 1.96 * error),
+        "sprt": sprt(wins, losses, elo0, elo1),
+        "engines": engines,
+        "by_size": {size: sum(g["winner"] == a for g in games if g["size"] == size) /
+                    sum(1 for g in games if g["size"] == size)
+                    for size in sorted({game["size"] for game in games})},
+    }
+
+
+def run_match(a: dict, b: dict, games: int, sizes, workers=None, opening_plies: int = 2, seed: int = 0,
+              elo0: float = 0.0, elo1: float = 30.0, stop_on_sprt: bool = False, records=None) -> dict:
+    """ Juega `games` partidas por tamaño entre a y b ({"name", "class", "args"}) en un pool de procesos.
+        Devuelve {"summary": ..., "games": [...]}. Con stop_on_sprt se cancelan las partidas pendientes
+        en cuanto el SPRT acepta una de las hipótesis"""
+    if a["name"] == b["name"]:
+        b = dict(b, name=b["name"] + "'")
+    jobs = []
+    for size in sizes:
+        for game in range(games):
+            pair_seed = seed + size * 100_003 + game // 2     # Mismo sorteo para las dos partidas del par
+            first, second = (a, b) if game % 2 == 0 else (b, a)
+            jobs.append((len(jobs), size, first, second, opening_plies, pair_seed, records))
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_game, *job) for job in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if stop_on_sprt and summarize(results, a["name"], b["name"], elo0, elo1)["sprt"]["result"] != "continuar":
+                for pending in futures:
+                    pending.cancel()
+                break
+    results.sort(key=lambda game: game["game"])
+    return {"summary": summarize(results, a["name"], b["name"], elo0, elo1), "games": results}
+
+
+def write_json(path: str, match: dict):
+    with open(path, "w", encoding="utf-8") as out:
+        json.dump(match, out, indent=2, ensure_ascii=False)
+
+
+def write_csv(path: str, match: dict):
+    """Una fila por jugada"""
+    fields = ["game", "size", "ply", "engine", "player", "row", "col", "latency", "nodes", "depth", "opening", "winner"]
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        for game in match["games"]:
+            for ply, move in enumerate(game["moves"]):
+                writer.writerow({"game": game["game"], "size": game["size"], "ply": ply,
+                                 "winner": game["winner"], **{key: move[key] for key in fields if key in move}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneo sin interfaz entre dos jugadores")
+    parser.add_argument("--a", required=True, help="módulo:Clase del jugador A (p. ej. player:HexAIPlayer)")
+    parser.add_argument("--a-args", default='{"time_limit": 1}', help="argumentos del constructor (JSON)")
+    parser.add_argument("--a-name", default=None)
+    parser.add_argument("--b", required=True)
+    parser.add_argument("--b-args", default='{"time_limit": 1}')
+    parser.add_argument("--b-name", default=None)
+    parser.add_argument("--games", type=int, default=10, help="partidas por tamaño")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--opening-plies", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=30.0)
+    parser.add_argument("--stop-on-sprt", action="store_true")
+    parser.add_argument("--json", default=None)
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--records", default=None, help="carpeta para los registros binarios de las partidas")
+    args = parser.parse_args()
+
+    a = {"name": args.a_name or args.a.partition(":")[2], "class": args.a, "args": json.loads(args.a_args)}
+    b = {"name": args.b_name or args.b.partition(":")[2], "class": args.b, "args": json.loads(args.b_args)}
+    match = run_match(a, b, args.games, args.sizes, args.workers, args.opening_plies, args.seed,
+                      args.elo0, args.elo1, args.stop_on_sprt, args.records)
+    summary = match["summary"]
+    print(f"{summary['a']} contra {summary['b']}: {summary['games']} partidas, "
+          f"{summary['win_rate']:.1%} para {summary['a']}, Elo {summary['elo']:+.0f} "
+          f"[{summary['elo_low']:+.0f}, {summary['elo_high']:+.0f}], "
+          f"SPRT({summary['sprt']['elo0']:g}, {summary['sprt']['elo1']:g}) "
+          f"LLR {summary['sprt']['llr']:.2f} -> {summary['sprt']['result']}")
+    for size, rate in summary["by_size"].items():
+        print(f"  N={size}: {rate:.1%}")
+    for name, stats in summary["engines"].items():
+        nodes = f"{stats['nodes_mean']:.0f}" if stats["nodes_mean"] is not None else "-"
+        print(f"  {name}: latencia media {stats['latency_mean'] * 1000:.0f} ms, p95 "
+              f"{stats['latency_p95'] * 1000:.0f} ms, máx {stats['latency_max'] * 1000:.0f} ms, nodos {nodes}")
+    if args.json:
+        write_json(args.json, match)
+    if args.csv:
+        write_csv(args.csv, match)
+
+
+if __name__ == "__main__":
+    main()
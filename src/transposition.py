@@ -0,0 +1,83 @@
+from array import array
+
+EXACT = 0   # El valor guardado es exacto
+LOWER = 1   # El valor es una cota inferior (hubo corte beta)
+UPPER = 2   # El valor es una cota superior (ninguna jugada superó alpha)
+
+NO_MOVE = -1
+ENTRY_BYTES = 8 + 2 + 1 + 8 + 4   # clave + profundidad + tipo de cota + valor + jugada
+
+
+class TranspositionTable:
+    """ Tabla de transposición de tamaño fijo guardada en arrays compactos.
+        Cada índice es un cubo de dos entradas (esquema de dos niveles):
+          - la primera solo se reemplaza por búsquedas de igual o mayor profundidad
+          - la segunda se reemplaza siempre"""
+    def __init__(self, megabytes: float = 16):
+        self.buckets = max(1, int(megabytes * 1024 * 1024) // (2 * ENTRY_BYTES))
+        self.clear()
+
+    def clear(self):
+        """Vacía la tabla y reinicia los contadores"""
+        slots = self.buckets * 2
+        self.keys = array("Q", bytes(8 * slots))
+        self.depths = array("h", [-1]) * slots      # -1 = entrada vacía
+        self.flags = array("b", bytes(slots))
+        self.scores = array("d", bytes(8 * slots))
+        self.moves = array("i", [NO_MOVE]) * slots
+        self.hits = 0           # La clave estaba en la tabla
+        self.misses = 0         # Cubo sin la clave y con alguna entrada vacía
+        self.collisions = 0     # Cubo lleno con otras claves (posiciones distintas en el mismo índice)
+        self.stores = 0
+        self.overwrites = 0     # Entradas válidas de otras posiciones que se reemplazaron
+
+    def probe(self, key: int):
+        """Devuelve (profundidad, tipo de cota, valor, jugada) o None si la posición no está"""
+        slot = (key % self.buckets) * 2
+        keys = self.keys
+        for i in (slot, slot + 1):
+            if keys[i] == key and self.depths[i] >= 0:
+                self.hits += 1
+                return self.depths[i], self.flags[i], self.scores[i], self.moves[i]
+        if self.depths[slot] >= 0 and self.depths[slot + 1] >= 0:
+            self.collisions += 1
+        else:
+            self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: float, move: int = NO_MOVE):
+        """Guarda una entrada según la política de reemplazo de dos niveles"""
+        slot = (key % self.buckets) * 2
+        if self.keys[slot] == key or depth >= self.depths[slot]:
+            i = slot                # Nivel de profundidad preferida
+        else:
+            i = slot + 1            # Nivel de reemplazo siempre
+        if self.depths[i] >= 0 and self.keys[i] != key:
+            self.overwrites += 1
+        elif self.keys[i] == key and move == NO_MOVE:
+            move = self.moves[i]    # Conservar la mejor jugada conocida de la misma posición
+        self.keys[i] = key
+        self.depths[i] = depth
+        self.flags[i] = flag
+        self.scores[i] = score
+        self.moves[i] = move
+        self.stores += 1
+
+    def usage(self) -> float:
+        """Fracción de entradas ocupadas"""
+        return sum(1 for d in self.depths if d >= 0) / len(self.depths)
+
+    def stats(self) -> dict:
+        """Contadores para dimensionar la tabla según el tiempo disponible"""
+        probes = self.hits + self.misses + self.collisions
+        return {
+            "entries": len(self.depths),
+            "bytes": len(self.depths) * ENTRY_BYTES,
+            "probes": probes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+        }
@@ -0,0 +1,53 @@
+class UnionFind:
+    """ Conjuntos disjuntos con unión por tamaño. No se comprimen caminos para que
+        cada unión se pueda deshacer (ver mark/rollback)"""
+    def __init__(self, n: int):
+        self.parent = list(range(n))    # Padre de cada nodo (la raíz es su propio padre)
+        self.rank = [1] * n             # Tamaño del conjunto (solo válido en las raíces)
+        self.history = []               # Raíz absorbida por cada unión (None si no hubo cambio)
+
+    def copy(self) -> "UnionFind":
+        """Devuelve una copia independiente (sin historial)"""
+        uf = UnionFind.__new__(UnionFind)
+        uf.parent = self.parent[:]
+        uf.rank = self.rank[:]
+        uf.history = []
+        return uf
+
+    def find(self, x: int) -> int:
+        """Devuelve la raíz del conjunto de x"""
+        parent = self.parent
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Une los conjuntos de a y b. Devuelve True si eran distintos"""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            self.history.append(None)
+            return False
+        if self.rank[ra] < self.rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra        # La raíz del conjunto menor cuelga de la del mayor
+        self.rank[ra] += self.rank[rb]
+        self.history.append(rb)
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def mark(self) -> int:
+        """Punto de restauración para rollback"""
+        return len(self.history)
+
+    def rollback(self, mark: int):
+        """Deshace todas las uniones hechas después de `mark`"""
+        history = self.history
+        parent = self.parent
+        while len(history) > mark:
+            rb = history.pop()
+            if rb is not None:
+                ra = parent[rb]
+                parent[rb] = rb
+                self.rank[ra] -= self.rank[rb]
@@ -0,0 +1,188 @@
+from hex_geometry import flat_neighbor_table, edge_cells
+
+WIN, UNKNOWN, LOSS = 1, 0, -1
+
+
+class VCSolver:
+    """ Conexiones virtuales con H-search (Anshelevich) entre los grupos de un jugador y sus bordes.
+        - VC (conexión virtual): el jugador conecta los extremos aunque el rival juegue primero
+        - SC (semiconexión): conecta si juega primero, en la casilla clave
+        Los portadores (casillas vacías que usa la conexión) son máscaras de bits de índices planos.
+        Reglas:
+          - base: casillas/grupos vecinos forman una VC con portador vacío
+          - Y: VC(x, z) + VC(z, y) con portadores disjuntos da VC(x, y) si z es un grupo propio,
+            o SC(x, y) con clave z si z es una casilla vacía
+          - O: varias SC(x, y) cuyos portadores no tienen ninguna casilla en común dan una VC(x, y)
+        Los puentes y las plantillas de borde de fila 2 (y algunas de fila 3) salen de estas reglas.
+        Los extremos son las casillas vacías, los grupos propios y los dos bordes, y toda conexión
+        derivada tiene al menos un extremo que no es una casilla vacía (grupo o borde)"""
+    MAX_CARRIER = 14    # Casillas máximas de un portador
+    MAX_VCS = 4         # Portadores que se guardan por par de extremos (los más pequeños)
+    MAX_SCS = 8
+    MAX_WORK = 200_000  # Combinaciones de la regla Y por llamada (acota el tiempo en tableros grandes)
+
+    def __init__(self, size: int):
+        self.size = size
+        self.cells = size * size
+        self.neighbors = flat_neighbor_table(size)
+        self.edges = {1: edge_cells(size, 1), 2: edge_cells(size, 2)}
+
+    def solve(self, grid: list, player_id: int) -> tuple:
+        """ Análisis de la posición (lista plana) con player_id por mover. Devuelve (resultado, jugadas):
+              (WIN, [jugada ganadora]), (LOSS, [jugada que más resiste]),
+              (UNKNOWN, región donde hay que jugar) o (UNKNOWN, []) si no hay restricción.
+            Las jugadas son (fila, col)"""
+        opponent_id = 3 - player_id
+        own = self.connections(grid, player_id)
+        if own is True:
+            return WIN, []
+        start, end = self.cells, self.cells + 1
+        vcs, scs = own
+        if vcs[start].get(end):
+            carrier = min(vcs[start][end], key=int.bit_count)
+            return WIN, [self.cell(carrier & -carrier)] if carrier else []
+        if scs[start].get(end):
+            key = min(scs[start][end], key=lambda sc: sc[0].bit_count())[1]
+            return WIN, [divmod(key, self.size)]
+
+        other = self.connections(grid, opponent_id)
+        if other is True:
+            return LOSS, []
+        vcs, scs = other
+        threats = [carrier for carrier in vcs[start].get(end, [])]
+        threats += [carrier for carrier, _ in scs[start].get(end, [])]
+        if not threats:
+            return UNKNOWN, []
+        must_play = -1
+        for carrier in threats:
+            must_play &= carrier
+        if vcs[start].get(end) or must_play == 0:
+            # El rival ya conecta, o ninguna jugada corta todas sus amenazas: derrota demostrada.
+            # Se juega la casilla que aparece en más portadores
+            counts = {}
+            for carrier in threats:
+                while carrier:
+                    low = carrier & -carrier
+                    counts[low] = counts.get(low, 0) + 1
+                    carrier ^= low
+            return LOSS, [self.cell(max(counts, key=counts.get))] if counts else []
+        region = []
+        while must_play:
+            low = must_play & -must_play
+            region.append(self.cell(low))
+            must_play ^= low
+        return UNKNOWN, region
+
+    def cell(self, bit: int) -> tuple:
+        return divmod(bit.bit_length() - 1, self.size)
+
+    def connections(self, grid: list, player_id: int):
+        """ H-search para player_id. Devuelve (vcs, scs) indexados por extremo: vcs[x][y] = [portador, ...],
+            scs[x][y] = [(portador, clave), ...]; los bordes son los extremos N² (inicial) y N² + 1 (final).
+            Devuelve True si el jugador ya está conectado"""
+        n = self.cells
+        start, end = n, n + 1
+        neighbors = self.neighbors
+        first_edge, last_edge = (set(cells) for cells in self.edges[player_id])
+
+        # Cada grupo propio es un extremo; los que tocan un borde se funden con él
+        node = list(range(n))
+        labels = n + 2
+        for index in range(n):
+            if grid[index] == player_id and node[index] == index:
+                group = [index]
+                seen = {index}
+                for cell in group:
+                    for neighbor in neighbors[cell]:
+                        if grid[neighbor] == player_id and neighbor not in seen:
+                            seen.add(neighbor)
+                            group.append(neighbor)
+                at_first = any(cell in first_edge for cell in group)
+                at_last = any(cell in last_edge for cell in group)
+                if at_first and at_last:
+                    return True
+                label = start if at_first else end if at_last else labels
+                labels += 1
+                for cell in group:
+                    node[cell] = label
+
+        vcs = {x: {} for x in range(labels)}
+        scs = {x: {} for x in range(labels)}
+        queue = []
+        empty = [index for index in range(n) if grid[index] == 0]
+        for index in empty:
+            for neighbor in neighbors[index]:
+                if grid[neighbor] == 0:
+                    if neighbor > index:
+                        self.add_vc(vcs, queue, index, neighbor, 0, base=True)
+                elif grid[neighbor] == player_id:
+                    self.add_vc(vcs, queue, index, node[neighbor], 0)
+            if index in first_edge:
+                self.add_vc(vcs, queue, index, start, 0)
+            if index in last_edge:
+                self.add_vc(vcs, queue, index, end, 0)
+
+        work = 0
+        while queue and work < self.MAX_WORK:
+            x, y, carrier = queue.pop()
+            for middle, outer in ((y, x), (x, y)):
+                middle_empty = middle < n
+                middle_bit = 1 << middle if middle_empty else 0
+                outer_bit = 1 << outer if outer < n else 0
+                for other, carriers in list(vcs[middle].items()):
+                    if other == outer or (outer < n and other < n):
+                        continue    # Hace falta al menos un extremo que sea grupo o borde
+                    other_bit = 1 << other if other < n else 0
+                    for second in carriers:
+                        work += 1
+                        if carrier & second or second & outer_bit or carrier & other_bit:
+                            continue
+                        union = carrier | second | middle_bit
+                        if union.bit_count() > self.MAX_CARRIER:
+                            continue
+                        if middle_empty:
+                            self.add_sc(vcs, scs, queue, outer, other, union, middle)
+                        else:
+                            self.add_vc(vcs, queue, outer, other, union)
+        return vcs, scs
+
+    def add_vc(self, vcs: dict, queue: list, x: int, y: int, carrier: int, base=False) -> bool:
+        """Agrega una VC si ninguna guardada tiene un portador contenido en el suyo"""
+        carriers = vcs[x].setdefault(y, [])
+        for known in carriers:
+            if known & carrier == known:
+                return False
+        kept = [known for known in carriers if known & carrier != carrier]
+        if len(kept) >= self.MAX_VCS:
+            largest = max(kept, key=int.bit_count)
+            if largest.bit_count() <= carrier.bit_count():
+                return False
+            kept.remove(largest)
+        kept.append(carrier)
+        vcs[x][y] = kept
+        vcs[y][x] = kept
+        if not base:    # Las VC base entre dos casillas vacías se combinan desde su otro par (el del grupo)
+            queue.append((x, y, carrier))
+        return True
+
+    def add_sc(self, vcs: dict, scs: dict, queue: list, x: int, y: int, carrier: int, key: int):
+        """Agrega una SC y aplica la regla O con las SC del mismo par"""
+        for known in vcs[x].get(y, ()):
+            if known & carrier == known:
+                return  # Ya hay una VC con portador menor
+        semis = scs[x].setdefault(y, [])
+        for known, _ in semis:
+            if known & carrier == known:
+                return
+        if len(semis) >= self.MAX_SCS:
+            return
+        semis.append((carrier, key))
+        scs[y][x] = semis
+        union = intersection = carrier
+        for known, _ in sorted(semis, key=lambda sc: sc[0].bit_count()):
+            if intersection & known != intersection:
+                union |= known
+                intersection &= known
+                if not intersection:
+                    self.add_vc(vcs, queue, x, y, union)
+                    return
@@ -0,0 +1,29 @@
+import random
+
+ZOBRIST_SEED = 0x4E58   # Semilla fija: el mismo tablero tiene el mismo hash en todos los procesos
+SIDE_KEY = random.Random(ZOBRIST_SEED - 1).getrandbits(64)  # Se combina con el hash cuando juega el oponente
+
+_KEYS = {}  # Claves por tamaño: {size: [clave(casilla, jugador)]}, índice (fila*size+col)*2 + (jugador-1)
+
+
+def zobrist_keys(size: int) -> list:
+    """Devuelve (y cachea) una clave aleatoria de 64 bits por casilla y jugador"""
+    keys = _KEYS.get(size)
+    if keys is None:
+        rng = random.Random(ZOBRIST_SEED + size)
+        keys = [rng.getrandbits(64) for _ in range(size * size * 2)]
+        _KEYS[size] = keys
+    return keys
+
+
+def hash_matrix(matrix: list) -> int:
+    """Calcula desde cero el hash de una matriz NxN (para verificar el hash incremental)"""
+    size = len(matrix)
+    keys = zobrist_keys(size)
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            cell = matrix[row][col]
+            if cell != 0:
+                value ^= keys[(row * size + col) * 2 + cell - 1]
+    return value